@@ -14,13 +14,62 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str
     JWT_EXPIRE: int
     POSTGRES_URI: str
+    # Réplica de lectura opcional para dashboards y listados
+    POSTGRES_READ_URI: str | None = None
+    DB_READ_AFTER_WRITE_SECONDS: int = 5
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10
+    DB_POOL_RECYCLE: int = 1800
+    # Un SELECT 1 en cada checkout; con recycle suele bastar sin él
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_WARMUP: bool = True
+    # 0 si se usa pgbouncer en modo transaction
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_APPLICATION_NAME: str = "cx-backend"
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    DB_JIT: bool = False
+    # Usuario de login de la API si las migraciones corren con otro: la de RLS
+    # le concede el rol cx_tenant
+    DB_APP_USER: str | None = None
     CLOUDFLARE_STREAM_KEY: str
     CLOUDFLARE_ACCOUNT_ID: str
     R2_ACCESS_KEY_ID: str
     R2_SECRET_ACCESS_KEY: str
     R2_BUCKET: str
     R2_ENDPOINT_URL: str
+    R2_MAX_POOL_CONNECTIONS: int = 20
+    R2_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    R2_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+    R2_MAX_CONCURRENCY: int = 4
+    R2_PRESIGNED_URL_TTL: int = 900
     OPENAI_API_KEY: str
+    # Sin token /metrics responde 404
+    METRICS_TOKEN: str | None = None
+    # Respuestas más chicas que esto no compensan el costo de comprimir
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 6
+    LOG_LEVEL: str = "INFO"
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # Por defecto un worker por núcleo; cada uno abre su propio pool de
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW conexiones
+    SERVER_WORKERS: int | None = None
+    # Espera a peticiones y BackgroundTasks (análisis de audio) tras un SIGTERM;
+    # el orquestador debe dar más tiempo antes de su SIGKILL
+    SERVER_GRACEFUL_TIMEOUT: int = 300
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    # Procesos de bcrypt para importar usuarios, por worker: con un worker por
+    # núcleo, por defecto un cuarto de los núcleos
+    PASSWORD_HASH_WORKERS: int | None = None
+    # /health/ready cachea su resultado: el balanceador puede consultarlo seguido
+    HEALTH_CACHE_TTL: float = 5
+    HEALTH_DB_TIMEOUT: float = 2
+    # Con más análisis en curso el worker deja de recibir tráfico nuevo
+    HEALTH_MAX_ANALYSES: int | None = None
+    # Alcance de Cloudflare, R2 y OpenAI; solo informativo
+    HEALTH_CHECK_DEPENDENCIES: bool = False
+    HEALTH_DEPENDENCIES_TTL: float = 60
 
 
 settings = Settings()
@@ -1,17 +1,67 @@
+import asyncio
+import logging
 from typing import AsyncGenerator
-from sqlalchemy import AsyncAdaptedQueuePool
-from sqlalchemy.orm import sessionmaker
+from fastapi import Depends, Request
+from sqlalchemy import AsyncAdaptedQueuePool, event, text
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from app.core.metrics import instrument_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 
+logger = logging.getLogger(__name__)
 
-engine = create_async_engine(
-    settings.POSTGRES_URI,
-    echo=False,
-    poolclass=AsyncAdaptedQueuePool,
-    pool_pre_ping=True,
+# Cabecera con la que el cliente fuerza leer del primario tras escribir. La
+# necesitan los clientes que no envían cookies (fetch con credentials: "omit")
+READ_PRIMARY_HEADER = "x-read-primary"
+
+# Cookie de vida corta que se pone en las respuestas que escribieron: la ve
+# cualquier worker, a diferencia de un registro en memoria
+READ_PRIMARY_COOKIE = "cx_read_primary"
+
+# Rol creado por la migración de RLS; sus políticas filtran por app.company_id
+TENANT_ROLE = "cx_tenant"
+
+# Equivale a SET LOCAL ROLE / SET LOCAL app.company_id, pero admite parámetros
+_TENANT_SCOPE = text(
+    "SELECT set_config('role', :role, true), "
+    "set_config('app.company_id', :company_id, true)"
 )
 
+
+def _create_engine(uri: str) -> AsyncEngine:
+    return create_async_engine(
+        uri,
+        echo=False,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # Caché de sentencias preparadas de SQLAlchemy y de asyncpg
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "application_name": settings.DB_APPLICATION_NAME,
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+                # Las consultas del API son cortas: compilar con JIT cuesta más
+                # que ejecutar
+                "jit": "on" if settings.DB_JIT else "off",
+            },
+        },
+    )
+
+
+engine = _create_engine(settings.POSTGRES_URI)
+instrument_engine(engine)
+
+# Sin réplica configurada las lecturas van al primario
+read_engine = engine
+if settings.POSTGRES_READ_URI:
+    read_engine = _create_engine(settings.POSTGRES_READ_URI)
+    instrument_engine(read_engine)
+
 AsyncSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -20,7 +70,112 @@ AsyncSessionLocal = sessionmaker(
     class_=AsyncSession,
 )
 
+AsyncReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_recent_write(session: Session) -> None:
+    # Una sola cookie aunque la petición haga varios commits
+    response = session.info.pop("response", None)
+    if response is not None:
+        # El frontend es de otro origen (CORS con credenciales): en prod la
+        # cookie debe ser SameSite=None para que vuelva en sus fetch; eso exige
+        # Secure. En dev se sirve por http, y localhost es el mismo sitio
+        secure = settings.PROJECT_MODE == "prod"
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            "1",
+            max_age=settings.DB_READ_AFTER_WRITE_SECONDS,
+            httponly=True,
+            secure=secure,
+            samesite="none" if secure else "lax",
+        )
+
+
+# SET LOCAL dura lo que la transacción: se repite al abrir cada una
+@event.listens_for(Session, "after_begin")
+def _apply_tenant_scope(session: Session, transaction, connection) -> None:
+    company_id = session.info.get("company_id")
+    if company_id is not None:
+        connection.execute(
+            _TENANT_SCOPE, {"role": TENANT_ROLE, "company_id": str(company_id)}
+        )
+
+
+async def scope_session_to_company(session: AsyncSession, company_id: int) -> None:
+    session.info["company_id"] = company_id
+
+    # La transacción en curso (la de la autenticación) ya pasó por after_begin
+    if session.in_transaction():
+        await session.execute(
+            _TENANT_SCOPE, {"role": TENANT_ROLE, "company_id": str(company_id)}
+        )
+
+
+def _read_from_primary(request: Request) -> bool:
+    # El navegador descarta la cookie al vencer max_age
+    return bool(
+        request.headers.get(READ_PRIMARY_HEADER)
+        or request.cookies.get(READ_PRIMARY_COOKIE)
+    )
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db(
+    request: Request, session: AsyncSession = Depends(get_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    # Read-your-writes: tras una escritura reciente se reutiliza la sesión primaria
+    if read_engine is engine or _read_from_primary(request):
+        yield session
+        return
+
+    # La autenticación ya usó el primario: se libera su conexión antes de leer
+    await session.close()
+
+    async with AsyncReadSessionLocal() as read_session:
+        yield read_session
+
+
+async def warm_up_pool() -> None:
+    # Abre pool_size conexiones a la vez para que las primeras peticiones no
+    # paguen el connect (TLS + auth) dentro de su latencia
+    async def checkout(target: AsyncEngine):
+        async with target.connect() as connection:
+            await connection.exec_driver_sql("SELECT 1")
+
+    engines = {engine, read_engine}
+    for target in engines:
+        try:
+            await asyncio.gather(
+                *(checkout(target) for _ in range(settings.DB_POOL_SIZE))
+            )
+        except Exception:
+            logger.warning(
+                "Database pool warm-up failed",
+                extra={"database": target.url.database},
+                exc_info=True,
+            )
+            continue
+
+        logger.info(
+            "Database pool warmed up",
+            extra={
+                "database": target.url.database,
+                "connections": target.pool.checkedin(),
+            },
+        )
+
+
+async def dispose_engines() -> None:
+    for target in {engine, read_engine}:
+        await target.dispose()
@@ -0,0 +1,28 @@
+import httpx
+
+# Un cliente por proceso: reutiliza conexiones (TLS) con Cloudflare entre
+# peticiones y entre los reintentos del pipeline de audio
+_client: httpx.AsyncClient | None = None
+
+
+# transport solo lo usan los benchmarks para simular Cloudflare
+def init_http_client(
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    global _client
+
+    if _client is None:
+        _client = httpx.AsyncClient(transport=transport)
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    return _client or init_http_client()
+
+
+async def close_http_client() -> None:
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,38 @@
+import json
+import logging
+import sys
+from datetime import UTC, datetime
+
+# Atributos propios de LogRecord; el resto llega por `extra` y se serializa
+_RECORD_FIELDS = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update(
+            (key, value)
+            for key, value in record.__dict__.items()
+            if key not in _RECORD_FIELDS and not key.startswith("_")
+        )
+
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def configure_logging(level: str = "INFO") -> None:
+    # Solo el espacio "app"; uvicorn conserva su propio formato
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+
+    logger = logging.getLogger("app")
+    logger.handlers = [handler]
+    logger.setLevel(level.upper())
+    logger.propagate = False
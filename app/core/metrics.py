@@ -0,0 +1,221 @@
+import re
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+STAGE_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200)
+THROUGHPUT_BUCKETS = (1e5, 5e5, 1e6, 2.5e6, 5e6, 1e7, 2.5e7, 5e7, 1e8)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+# Métricas en memoria del proceso, expuestas en formato de texto de Prometheus
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for key, (counts, total, count) in self._series.items():
+                for bound, bucket in zip(self.buckets, counts):
+                    labels = _labels(self.labels + ("le",), key + (bound,))
+                    lines.append(f"{self.name}_bucket{labels} {bucket}")
+                labels = _labels(self.labels + ("le",), key + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._series: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def set(self, value: float, **labels) -> None:
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._series[key] = value
+
+    def remove(self, **labels) -> None:
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._series.pop(key, None)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} gauge",
+        ]
+        with self._lock:
+            for key, value in self._series.items():
+                lines.append(f"{self.name}{_labels(self.labels, key)} {value}")
+        return lines
+
+
+REGISTRY: list[Histogram | Gauge] = []
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# ----------- REQUEST / SQL -----------
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Tiempo total de la petición",
+    ("method", "route", "status"),
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements",
+    "Sentencias SQL ejecutadas por petición",
+    ("method", "route"),
+    COUNT_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Tiempo en base de datos por petición",
+    ("method", "route"),
+)
+ROUTE_SLOWEST_STATEMENT = Gauge(
+    "http_route_slowest_statement_seconds",
+    "Sentencia SQL más lenta observada por ruta",
+    ("method", "route", "statement"),
+)
+
+# ----------- MEDIA PIPELINE -----------
+PIPELINE_STAGE_DURATION = Histogram(
+    "media_pipeline_stage_seconds",
+    "Duración de cada etapa del análisis de video",
+    ("stage", "status"),
+    STAGE_BUCKETS,
+)
+PIPELINE_IN_FLIGHT = Gauge(
+    "media_pipeline_in_flight",
+    "Análisis de video en curso en el proceso",
+)
+PIPELINE_IN_FLIGHT.set(0)
+PIPELINE_DOWNLOAD_THROUGHPUT = Histogram(
+    "media_pipeline_download_bytes_per_second",
+    "Velocidad de descarga del video desde Cloudflare Stream",
+    (),
+    THROUGHPUT_BUCKETS,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str = ""
+    # Tras enviar la respuesta no se cuentan las BackgroundTasks
+    closed: bool = False
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+# (método, ruta) -> (duración, sentencia) de la más lenta registrada
+_slowest_by_route: dict[tuple[str, str], tuple[float, str]] = {}
+
+
+def record_request(
+    method: str, route: str, status: int, duration: float, stats: RequestStats
+) -> None:
+    REQUEST_DURATION.observe(duration, method=method, route=route, status=status)
+    REQUEST_SQL_STATEMENTS.observe(stats.statements, method=method, route=route)
+    REQUEST_DB_DURATION.observe(stats.db_time, method=method, route=route)
+
+    previous = _slowest_by_route.get((method, route))
+    if stats.statements and (previous is None or stats.slowest_time > previous[0]):
+        if previous is not None:
+            ROUTE_SLOWEST_STATEMENT.remove(
+                method=method, route=route, statement=previous[1]
+            )
+        _slowest_by_route[(method, route)] = (
+            stats.slowest_time,
+            stats.slowest_statement,
+        )
+        ROUTE_SLOWEST_STATEMENT.set(
+            stats.slowest_time,
+            method=method,
+            route=route,
+            statement=stats.slowest_statement,
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    # Los eventos corren en el greenlet de la petición, así que ven su contexto
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+        stats = request_stats.get()
+        if stats is None or stats.closed:
+            return
+
+        stats.statements += 1
+        stats.db_time += elapsed
+        if elapsed > stats.slowest_time:
+            stats.slowest_time = elapsed
+            stats.slowest_statement = _WHITESPACE.sub(" ", statement)[:200]
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start"):
+            connection.info["query_start"].pop()
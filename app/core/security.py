@@ -1,3 +1,7 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, status
@@ -10,6 +14,12 @@ from app.utils.exeptions import InvalidTokenException
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_hash_pool: ProcessPoolExecutor | None = None
+
+
+def _hash_pool_size() -> int:
+    return settings.PASSWORD_HASH_WORKERS or max(1, (os.cpu_count() or 1) // 4)
+
 
 def create_access_token(subject: str, expires_delta: timedelta) -> str:
 
@@ -56,3 +66,37 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+def get_password_hashes(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+
+async def hash_passwords(passwords: list[str]) -> list[str]:
+    # bcrypt es CPU puro: se reparte entre procesos para no bloquear el loop
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=_hash_pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    workers = _hash_pool_size()
+    size = max(1, -(-len(passwords) // workers))
+    chunks = [passwords[i : i + size] for i in range(0, len(passwords), size)]
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(_hash_pool, get_password_hashes, c) for c in chunks)
+    )
+
+    return [hashed for chunk in results for hashed in chunk]
+
+
+def close_hash_pool() -> None:
+    global _hash_pool
+
+    # Sin esto los procesos spawn quedan vivos tras apagar el worker
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=True)
+        _hash_pool = None
@@ -1,13 +1,55 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from app.middlewares.metrics_middleware import MetricsMiddleware
+from app.routes import health_router
 from app.routes.main import api_router
 from app.core.config import settings
+from app.core.db import dispose_engines, warm_up_pool
+from app.core.http_client import close_http_client, init_http_client
+from app.core.logger import configure_logging
+from app.core.security import close_hash_pool
+from app.services.cloudflare_rs_services import close_r2_client, init_r2_client
+from app.services.openai_services import close_openai_client
+from app.services.zone_services import warm_up_zones
+
+configure_logging(settings.LOG_LEVEL)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Un solo cliente R2 y HTTP (y sus pools de conexiones) por proceso
+    init_r2_client()
+    init_http_client()
+    if settings.DB_POOL_WARMUP:
+        await warm_up_pool()
+    # Las zonas se sirven desde memoria: ninguna petición paga la primera carga
+    await warm_up_zones()
+    yield
+    # uvicorn llega aquí después de drenar peticiones y BackgroundTasks
+    await close_http_client()
+    close_openai_client()
+    close_r2_client()
+    close_hash_pool()
+    await dispose_engines()
+
 
 # config
+# orjson codifica el JSON ya serializado por los response models ~10x más rápido
+# que json.dumps
 if settings.PROJECT_MODE == "prod":
-    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+    app = FastAPI(
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+        openapi_url=None,
+        docs_url=None,
+        redoc_url=None,
+    )
 else:
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.title = settings.PROJECT_NAME
 
@@ -28,5 +70,16 @@ app.add_middleware(
 
 # app.middleware("http")(db_exception_handler)
 
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+)
+
+# Server-Timing solo fuera de producción para no exponer tiempos internos
+app.add_middleware(MetricsMiddleware, server_timing=settings.PROJECT_MODE != "prod")
+
 # Routing
 app.include_router(api_router, prefix=settings.API_URL)
+# Fuera de API_URL: rutas fijas para el balanceador y el autoscaler
+app.include_router(health_router.router)
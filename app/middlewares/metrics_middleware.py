@@ -0,0 +1,62 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import RequestStats, record_request, request_stats
+
+
+# Middleware ASGI puro: mide también el envío de respuestas por partes
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        def record() -> None:
+            if stats.closed:
+                return
+            stats.closed = True
+
+            # Se agrupa por plantilla de ruta; lo que no coincide va junto
+            route = getattr(scope.get("route"), "path", "unmatched")
+            record_request(
+                scope["method"], route, status, time.perf_counter() - start, stats
+            )
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    db_time = stats.db_time * 1000
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f"app;dur={elapsed:.1f}, "
+                        f'db;dur={db_time:.1f};desc="{stats.statements} queries"',
+                    )
+            await send(message)
+
+            # La respuesta termina con el último body; las BackgroundTasks que
+            # corren después no cuentan como latencia de la petición
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                record()
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_stats.reset(token)
+            # Sin respuesta completa (error o desconexión) se registra aquí
+            record()
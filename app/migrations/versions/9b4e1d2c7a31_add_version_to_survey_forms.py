@@ -0,0 +1,30 @@
+"""add version to survey forms
+
+Revision ID: 9b4e1d2c7a31
+Revises: 2fbe48d2fb88
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4e1d2c7a31"
+down_revision: Union[str, None] = "2fbe48d2fb88"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "survey_forms",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("survey_forms", "version")
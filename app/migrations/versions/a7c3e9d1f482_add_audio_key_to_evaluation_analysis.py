@@ -0,0 +1,31 @@
+"""add audio key to evaluation analysis
+
+Revision ID: a7c3e9d1f482
+Revises: c4d8f0a6e215
+Create Date: 2026-10-19 15:20:12.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9d1f482"
+down_revision: Union[str, None] = "c4d8f0a6e215"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "evaluation_analysis",
+        sa.Column("audio_key", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("evaluation_analysis", "audio_key")
@@ -0,0 +1,149 @@
+"""enable tenant rls
+
+Revision ID: b8d2f4a6c913
+Revises: a7c3e9d1f482
+Create Date: 2026-10-19 18:02:41.507316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d2f4a6c913"
+down_revision: Union[str, None] = "a7c3e9d1f482"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rol sin login que asume la API (SET LOCAL ROLE) en las sesiones por empresa
+TENANT_ROLE = "cx_tenant"
+
+
+# Logins que hacen SET LOCAL ROLE: quien migra, los de las URIs de la API y
+# DB_APP_USER si la API se conecta con otro usuario
+def _tenant_role_members() -> set[str]:
+    uris = (settings.POSTGRES_URI, settings.POSTGRES_READ_URI)
+    users = {make_url(uri).username for uri in uris if uri}
+    users.add(settings.DB_APP_USER)
+    return {user for user in users if user}
+
+
+# Mismo filtro que aplicaban los servicios (p. ej. evaluaciones por campaña)
+POLICIES = {
+    "companies": "id = current_company_id()",
+    "users": "company_id = current_company_id()",
+    "payments": "company_id = current_company_id()",
+    "survey_forms": "company_id = current_company_id()",
+    "survey_sections": """EXISTS (
+        SELECT 1 FROM survey_forms f
+        WHERE f.id = survey_sections.form_id
+          AND f.company_id = current_company_id()
+    )""",
+    "survey_aspects": """EXISTS (
+        SELECT 1 FROM survey_sections s
+        JOIN survey_forms f ON f.id = s.form_id
+        WHERE s.id = survey_aspects.section_id
+          AND f.company_id = current_company_id()
+    )""",
+    "campaigns": "company_id = current_company_id()",
+    "campaign_users": """EXISTS (
+        SELECT 1 FROM campaigns c
+        WHERE c.id = campaign_users.campaign_id
+          AND c.company_id = current_company_id()
+    )""",
+    "campaign_zones": """EXISTS (
+        SELECT 1 FROM campaigns c
+        WHERE c.id = campaign_zones.campaign_id
+          AND c.company_id = current_company_id()
+    )""",
+    "campaign_goals_evaluators": """EXISTS (
+        SELECT 1 FROM campaigns c
+        WHERE c.id = campaign_goals_evaluators.campaign_id
+          AND c.company_id = current_company_id()
+    )""",
+    "user_zones": """EXISTS (
+        SELECT 1 FROM users u
+        WHERE u.id = user_zones.user_id
+          AND u.company_id = current_company_id()
+    )""",
+    "evaluations": """EXISTS (
+        SELECT 1 FROM campaigns c
+        WHERE c.id = evaluations.campaigns_id
+          AND c.company_id = current_company_id()
+    )""",
+    "evaluation_answers": """EXISTS (
+        SELECT 1 FROM evaluations e
+        JOIN campaigns c ON c.id = e.campaigns_id
+        WHERE e.id = evaluation_answers.evaluation_id
+          AND c.company_id = current_company_id()
+    )""",
+    "evaluation_analysis": """EXISTS (
+        SELECT 1 FROM evaluations e
+        JOIN campaigns c ON c.id = e.campaigns_id
+        WHERE e.id = evaluation_analysis.evaluation_id
+          AND c.company_id = current_company_id()
+    )""",
+    "videos": """EXISTS (
+        SELECT 1 FROM evaluations e
+        JOIN campaigns c ON c.id = e.campaigns_id
+        WHERE e.video_id = videos.id
+          AND c.company_id = current_company_id()
+    )""",
+    "notifications": """EXISTS (
+        SELECT 1 FROM users u
+        WHERE u.id = notifications.user_id
+          AND u.company_id = current_company_id()
+    )""",
+}
+
+
+def upgrade() -> None:
+    # Sin app.company_id (o vacío al terminar un SET LOCAL) no se ve ninguna fila
+    op.execute("""
+        CREATE OR REPLACE FUNCTION current_company_id() RETURNS int
+        LANGUAGE sql STABLE
+        AS $$ SELECT NULLIF(current_setting('app.company_id', true), '')::int $$
+        """)
+
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{TENANT_ROLE}') THEN
+                CREATE ROLE {TENANT_ROLE} NOLOGIN;
+            END IF;
+        END $$
+        """)
+    op.execute(f"GRANT {TENANT_ROLE} TO CURRENT_USER")
+    quote = op.get_bind().dialect.identifier_preparer.quote
+    for user in sorted(_tenant_role_members()):
+        op.execute(f"GRANT {TENANT_ROLE} TO {quote(user)}")
+    op.execute(f"GRANT USAGE ON SCHEMA public TO {TENANT_ROLE}")
+    op.execute(f"GRANT SELECT ON ALL TABLES IN SCHEMA public TO {TENANT_ROLE}")
+    op.execute(
+        f"ALTER DEFAULT PRIVILEGES IN SCHEMA public "
+        f"GRANT SELECT ON TABLES TO {TENANT_ROLE}"
+    )
+
+    # Reemplaza las políticas de app/sql (algunas leían app.empresa_id)
+    for table, using in POLICIES.items():
+        op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY")
+        op.execute(f"DROP POLICY IF EXISTS rls_{table} ON {table}")
+        op.execute(f"CREATE POLICY rls_{table} ON {table} FOR SELECT USING ({using})")
+
+
+def downgrade() -> None:
+    for table in POLICIES:
+        op.execute(f"DROP POLICY IF EXISTS rls_{table} ON {table}")
+        op.execute(f"ALTER TABLE {table} DISABLE ROW LEVEL SECURITY")
+
+    op.execute(
+        f"ALTER DEFAULT PRIVILEGES IN SCHEMA public "
+        f"REVOKE SELECT ON TABLES FROM {TENANT_ROLE}"
+    )
+    op.execute(f"DROP OWNED BY {TENANT_ROLE}")
+    op.execute(f"DROP ROLE IF EXISTS {TENANT_ROLE}")
+    op.execute("DROP FUNCTION IF EXISTS current_company_id()")
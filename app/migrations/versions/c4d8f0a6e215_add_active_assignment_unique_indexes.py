@@ -0,0 +1,58 @@
+"""add active assignment unique indexes
+
+Revision ID: c4d8f0a6e215
+Revises: 9b4e1d2c7a31
+Create Date: 2026-10-19 10:41:03.550917
+
+Before each index is created, duplicate active assignments are soft-deleted
+(deleted_at = now()), keeping the oldest row. This cannot be reversed: the
+downgrade drops the indexes but does not restore those rows, because they
+cannot be told apart from assignments that were deleted normally.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d8f0a6e215"
+down_revision: Union[str, None] = "9b4e1d2c7a31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+indexes = [
+    ("ix_campaign_users_active", "campaign_users", ["campaign_id", "user_id"]),
+    ("ix_campaign_zones_active", "campaign_zones", ["campaign_id", "zone_id"]),
+    ("ix_user_zones_active", "user_zones", ["user_id", "zone_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in indexes:
+        # Dar de baja duplicados activos, conservando la asignación más antigua
+        match = " AND ".join(f"t.{column} = d.{column}" for column in columns)
+        op.execute(
+            f"""
+            UPDATE {table} t SET deleted_at = now()
+            FROM {table} d
+            WHERE {match}
+              AND t.deleted_at IS NULL
+              AND d.deleted_at IS NULL
+              AND t.id > d.id
+            """
+        )
+        op.create_index(
+            name,
+            table,
+            columns,
+            unique=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+
+
+def downgrade() -> None:
+    for name, table, _ in indexes:
+        op.drop_index(name, table_name=table)
@@ -11,7 +11,11 @@ if TYPE_CHECKING:
     from app.models.campaign_goals_evaluator_model import CampaignGoalsEvaluator
 
 from app.models.company_model import Company
-from app.models.survey_forms_model import SurveyForm, SurveyFormPublic
+from app.models.survey_forms_model import (
+    SurveyForm,
+    SurveyFormPublic,
+    SurveyFormSummary,
+)
 from app.types.pagination import Pagination
 
 
@@ -83,6 +87,31 @@ class CampaignPublic(CampaignBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CampaignListItem(BaseModel):
+    id: int
+    company_id: int | None
+    name: str
+    objective: str | None
+    date_start: datetime
+    date_end: datetime
+    channel: ChannelType
+    survey_id: int | None
+    notes: str | None
+    goal: int
+    survey: SurveyFormSummary | None = None
+    created_at: datetime | None
+    updated_at: datetime | None
+    deleted_at: datetime | None
+
+
+class CampaignSummary(BaseModel):
+    id: int
+    name: str
+    channel: ChannelType
+    date_start: datetime
+    date_end: datetime
+
+
 class CampaignsPublic(BaseModel):
-    data: List[CampaignPublic]
+    data: List[CampaignListItem]
     pagination: Pagination
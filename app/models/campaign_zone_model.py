@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List
 from pydantic import BaseModel
-from sqlmodel import Column, DateTime, Field, Relationship, SQLModel, func
+from sqlmodel import Column, DateTime, Field, Index, Relationship, SQLModel, func, text
 
 from app.models.campaign_model import Campaign, CampaignPublic
 from app.models.campaign_user_model import CampaignUserPublic
@@ -16,6 +16,16 @@ class CampaignZoneBase(SQLModel):
 
 class CampaignZone(CampaignZoneBase, table=True):
     __tablename__ = "campaign_zones"
+    __table_args__ = (
+        # Una sola asignación activa por par; permite upserts idempotentes
+        Index(
+            "ix_campaign_zones_active",
+            "campaign_id",
+            "zone_id",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
     id: int | None = Field(default=None, primary_key=True)
     created_at: datetime = Field(sa_column=Column(DateTime, default=func.now()))
     updated_at: datetime = Field(
@@ -50,6 +50,12 @@ class CompanyPublic(CompanyBase):
     deleted_at: datetime | None
 
 
+# Resumen para listados de otras entidades
+class CompanySummary(BaseModel):
+    id: int
+    name: str
+
+
 class CompaniesPublic(BaseModel):
     data: List[CompanyPublic]
     pagination: Pagination
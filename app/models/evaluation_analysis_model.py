@@ -9,6 +9,8 @@ class EvaluationAnalysisBase(SQLModel):
     analysis: str
     executive_view: str | None
     operative_view: str | None
+    # Clave del audio en R2 (audios/{uuid}.mp3)
+    audio_key: str | None = Field(default=None)
 
 
 class EvaluationAnalysis(EvaluationAnalysisBase, table=True):
@@ -31,3 +33,8 @@ class EvaluationAnalysisPublic(EvaluationAnalysisBase):
     created_at: datetime | None
     updated_at: datetime | None
     deleted_at: datetime | None
+
+
+class EvaluationAudioPublic(SQLModel):
+    url: str
+    expires_at: datetime
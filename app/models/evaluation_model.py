@@ -6,9 +6,9 @@ from sqlmodel import Column, DateTime, Field, Integer, Relationship, SQLModel, f
 from sqlalchemy.dialects.postgresql import ARRAY
 
 
-from app.models.campaign_model import Campaign, CampaignPublic
+from app.models.campaign_model import Campaign, CampaignPublic, CampaignSummary
 from app.models.survey_model import SurveyAspect, SurveyAspectPublic
-from app.models.user_model import User, UserPublic
+from app.models.user_model import User, UserPublic, UserSummary
 from app.models.video_model import Video
 from app.types.pagination import Pagination
 
@@ -25,6 +25,11 @@ class StatusEnum(str, Enum):
     REJECTED = "rechazado"
 
 
+class ExportFormatEnum(str, Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
 # ----------- EVALUATION -----------
 class EvaluationBase(SQLModel):
     campaigns_id: int | None = Field(default=None, foreign_key="campaigns.id")
@@ -91,8 +96,32 @@ class EvaluationPublic(EvaluationBase):
     deleted_at: datetime | None
 
 
+# Filas de listado: solo columnas, sin entidades ORM ni relaciones completas
+class EvaluationListItem(BaseModel):
+    id: int
+    campaigns_id: int | None
+    video_id: int | None
+    user_id: int | None
+    location: str | None
+    evaluated_collaborator: str | None
+    status: StatusEnum
+    visited_zones: List[int] | None
+    campaign: CampaignSummary | None = None
+    user: UserSummary | None = None
+    created_at: datetime | None
+    updated_at: datetime | None
+    deleted_at: datetime | None
+
+
+class EvaluationSummary(BaseModel):
+    id: int
+    status: StatusEnum
+    evaluated_collaborator: str | None
+    campaign: CampaignSummary | None = None
+
+
 class EvaluationsPublic(BaseModel):
-    data: List[EvaluationPublic]
+    data: List[EvaluationListItem]
     pagination: Pagination
 
 
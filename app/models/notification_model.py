@@ -1,8 +1,14 @@
 from datetime import datetime
+from pydantic import BaseModel
 from sqlmodel import Column, DateTime, Field, Relationship, SQLModel, func
 
-from app.models.evaluation_model import Evaluation, EvaluationPublic, StatusEnum
-from app.models.user_model import User, UserPublic
+from app.models.evaluation_model import (
+    Evaluation,
+    EvaluationPublic,
+    EvaluationSummary,
+    StatusEnum,
+)
+from app.models.user_model import User, UserPublic, UserSummary
 
 
 class NotificationBase(SQLModel):
@@ -41,3 +47,17 @@ class NotificationPublic(NotificationBase):
     created_at: datetime | None
     updated_at: datetime | None
     deleted_at: datetime | None
+
+
+class NotificationListItem(BaseModel):
+    id: int
+    user_id: int | None
+    evaluation_id: int | None
+    status: StatusEnum
+    read: bool
+    comment: str | None
+    user: UserSummary | None = None
+    evaluation: EvaluationSummary | None = None
+    created_at: datetime | None
+    updated_at: datetime | None
+    deleted_at: datetime | None
@@ -11,6 +11,7 @@ from app.models.survey_model import (
     SurveySection,
     SurveySectionCreate,
     SurveySectionPublic,
+    SurveySectionUpdate,
 )
 
 
@@ -26,6 +27,7 @@ class SurveyFormUpdate(SQLModel):
 class SurveyForm(SurveyFormBase, table=True):
     __tablename__ = "survey_forms"
     id: int | None = Field(default=None, primary_key=True)
+    version: int = Field(default=1)
     created_at: datetime = Field(sa_column=Column(DateTime, default=func.now()))
     updated_at: datetime = Field(
         sa_column=Column(DateTime, default=func.now(), onupdate=func.now())
@@ -43,8 +45,21 @@ class SurveyFormsCreate(BaseModel):
     sections: List[SurveySectionCreate]
 
 
+class SurveyFormsUpdate(BaseModel):
+    title: str
+    sections: List[SurveySectionUpdate]
+
+
+# Resumen para listados de otras entidades
+class SurveyFormSummary(BaseModel):
+    id: int
+    title: str
+    version: int = 1
+
+
 class SurveyFormPublic(SurveyFormBase):
     id: int
+    version: int = 1
     sections: List[SurveySectionPublic] | None = None
     created_at: datetime | None
     updated_at: datetime | None
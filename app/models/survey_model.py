@@ -43,6 +43,11 @@ class SurveySectionCreate(SQLModel):
     aspects: List["SurveyAspectCreate"]
 
 
+class SurveySectionUpdate(SurveySectionCreate):
+    id: int | None = None
+    aspects: List["SurveyAspectUpdate"]
+
+
 class SurveySectionPublic(BaseModel):
     id: int
     name: str
@@ -84,6 +89,10 @@ class SurveyAspectCreate(SQLModel):
     order: int
 
 
+class SurveyAspectUpdate(SurveyAspectCreate):
+    id: int | None = None
+
+
 class SurveyAspectPublic(BaseModel):
     id: int
     description: str
@@ -1,10 +1,10 @@
 from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, List, Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from sqlmodel import Relationship, SQLModel, Field, Column, DateTime, func
 
-from app.models.company_model import Company
+from app.models.company_model import Company, CompanySummary
 from app.types.pagination import Pagination
 
 
@@ -56,6 +56,33 @@ class UserCreate(UserBase):
     password: str = Field(nullable=False, min_length=8, max_length=40)
 
 
+class UserImportRow(UserCreate):
+    zone_ids: List[int] = Field(default_factory=list)
+
+    @field_validator("zone_ids", mode="before")
+    @classmethod
+    def split_zone_ids(cls, value):
+        # En CSV las zonas llegan como "1;2;3"
+        if isinstance(value, str):
+            return [zone for zone in value.replace(",", ";").split(";") if zone]
+        return value
+
+
+class UserImportError(BaseModel):
+    row: int
+    email: str | None = None
+    detail: str
+
+
+class UserImportProgress(BaseModel):
+    processed: int = 0
+    created: int = 0
+    conflicts: int = 0
+    failed: int = 0
+    errors: List[UserImportError] = []
+    done: bool = False
+
+
 class UserUpdate(UserBase):
     email: EmailStr | None = Field(default=None, max_length=255)
     password: str | None = Field(default=None, min_length=8, max_length=40)
@@ -116,8 +143,34 @@ class UserPublic(UserBase):
     deleted_at: datetime | None
 
 
+class UserListItem(BaseModel):
+    id: int
+    role: int
+    first_name: str
+    last_name: str
+    gender: GenderEnum
+    birthdate: datetime | None
+    civil_status: CivilStatusEnum | None
+    socioeconomic: SocioeconomicEnum | None
+    inclusivity: str | None
+    email: str
+    company_id: int | None
+    company: CompanySummary | None = None
+    created_at: datetime | None
+    updated_at: datetime | None
+    deleted_at: datetime | None
+
+
+class UserSummary(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+    role: int
+
+
 class UsersPublic(BaseModel):
-    data: list[UserPublic]
+    data: list[UserListItem]
     pagination: Pagination
 
 
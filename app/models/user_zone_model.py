@@ -1,11 +1,11 @@
 from datetime import datetime
 from typing import List
 from pydantic import BaseModel
-from sqlmodel import Column, DateTime, Field, Relationship, SQLModel, func
+from sqlmodel import Column, DateTime, Field, Index, Relationship, SQLModel, func, text
 
 
 from app.models.user_model import User, UserPublic
-from app.models.zone_model import Zone
+from app.models.zone_model import Zone, ZonePublic
 from app.types.pagination import Pagination
 
 
@@ -16,6 +16,16 @@ class UserZoneBase(SQLModel):
 
 class UserZone(UserZoneBase, table=True):
     __tablename__ = "user_zones"
+    __table_args__ = (
+        # Una sola asignación activa por par; permite upserts idempotentes
+        Index(
+            "ix_user_zones_active",
+            "user_id",
+            "zone_id",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
     id: int | None = Field(default=None, primary_key=True)
     created_at: datetime = Field(sa_column=Column(DateTime, default=func.now()))
     updated_at: datetime = Field(
@@ -34,7 +44,7 @@ class UserZone(UserZoneBase, table=True):
 class UserZonePublic(UserZoneBase):
     id: int
     user: UserPublic | None = None
-    zone: Zone | None = None
+    zone: ZonePublic | None = None
     created_at: datetime | None
     updated_at: datetime | None
     deleted_at: datetime | None
@@ -83,9 +83,26 @@ async def assign_users(
     if request.state.user.role != 1:
         raise PermissionDeniedException(custom_message="assign users to campaign")
 
-    await assign_users_to_campaign(session, data.campaign_id, data.user_ids)
+    result = await assign_users_to_campaign(session, data.campaign_id, data.user_ids)
 
-    return {"message": "Campaign users assigned"}
+    return {"message": "Campaign users assigned", **result}
+
+
+@router.put("/")
+async def sync_users(
+    request: Request,
+    data: createCampaignUser,
+    session: AsyncSession = Depends(get_db),
+):
+    if request.state.user.role != 1:
+        raise PermissionDeniedException(custom_message="assign users to campaign")
+
+    # Deja exactamente la lista enviada como asignaciones activas
+    result = await assign_users_to_campaign(
+        session, data.campaign_id, data.user_ids, replace=True
+    )
+
+    return {"message": "Campaign users synchronized", **result}
 
 
 @router.delete("/{assignment_id}")
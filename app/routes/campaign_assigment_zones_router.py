@@ -82,9 +82,26 @@ async def assign_zones(
     if request.state.user.role != 1:
         raise PermissionDeniedException(custom_message="assign zones to campaign")
 
-    await assign_zones_to_campaign(session, data.campaign_id, data.zone_ids)
+    result = await assign_zones_to_campaign(session, data.campaign_id, data.zone_ids)
 
-    return {"message": "Campaign zones assigned"}
+    return {"message": "Campaign zones assigned", **result}
+
+
+@router.put("/")
+async def sync_zones(
+    request: Request,
+    data: createCampaignZone,
+    session: AsyncSession = Depends(get_db),
+):
+    if request.state.user.role != 1:
+        raise PermissionDeniedException(custom_message="assign zones to campaign")
+
+    # Deja exactamente la lista enviada como asignaciones activas
+    result = await assign_zones_to_campaign(
+        session, data.campaign_id, data.zone_ids, replace=True
+    )
+
+    return {"message": "Campaign zones synchronized", **result}
 
 
 @router.delete("/{assignment_id}")
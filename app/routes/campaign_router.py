@@ -2,7 +2,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.db import get_db, get_read_db
 from app.models.campaign_model import (
     CampaignBase,
     CampaignPublic,
@@ -12,6 +12,7 @@ from app.models.campaign_model import (
 from app.services.campaign_services import (
     create_campaign,
     get_campaign,
+    get_campaign_public,
     get_campaigns,
     soft_delete_campaign,
     update_campaign,
@@ -30,7 +31,7 @@ router = APIRouter(
 @router.get("/")
 async def get_all(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     offset: int = 0,
     limit: int = Query(default=10, le=50),
     filter: Optional[str] = None,
@@ -56,7 +57,7 @@ async def get_one(
     if request.state.user.role not in [1, 2, 3]:
         raise PermissionDeniedException(custom_message="retrieve this campaign")
 
-    campaign = await get_campaign(session, campaign_id)
+    campaign = await get_campaign_public(session, campaign_id)
 
     if campaign.company_id != request.state.user.company_id:
         raise PermissionDeniedException(custom_message="retrieve this campaign")
@@ -1,9 +1,8 @@
-import httpx
-
 from fastapi import APIRouter, Depends, Header, Response
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.core.http_client import get_http_client
 from app.utils.deps import get_auth_user
 
 
@@ -33,17 +32,16 @@ async def upload_cloudflare_stream(
         "Upload-Metadata": upload_metadata,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers)
-        response.raise_for_status()
-        location = response.headers.get("Location")
-
-        return Response(
-            status_code=201,
-            headers={
-                "Access-Control-Expose-Headers": "Location",
-                "Access-Control-Allow-Headers": "*",
-                "Access-Control-Allow-Origin": "*",
-                "Location": location,
-            },
-        )
+    response = await get_http_client().post(url, headers=headers)
+    response.raise_for_status()
+    location = response.headers.get("Location")
+
+    return Response(
+        status_code=201,
+        headers={
+            "Access-Control-Expose-Headers": "Location",
+            "Access-Control-Allow-Headers": "*",
+            "Access-Control-Allow-Origin": "*",
+            "Location": location,
+        },
+    )
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.db import get_read_db
 from app.services.user_evaluation_summary_services import (
     get_company_users_evaluations,
     get_manager_summary,
@@ -21,7 +21,7 @@ router = APIRouter(
 @router.get("/")
 async def get_dashboard(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ):
 
     match request.state.user.role:
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.models.evaluation_analysis_model import EvaluationAnalysisPublic
-from app.services.evaluation_analysis_services import get_evaluation_analysis
+from app.core.db import get_read_db
+from app.models.evaluation_analysis_model import (
+    EvaluationAnalysisPublic,
+    EvaluationAudioPublic,
+)
+from app.services.evaluation_analysis_services import (
+    get_evaluation_analysis,
+    get_evaluation_analysis_etag,
+    get_evaluation_audio_url,
+)
+from app.services.evaluation_services import get_evaluation_company_id
 from app.utils.deps import check_company_payment_status, get_auth_user
 from app.utils.exeptions import PermissionDeniedException
-
+from app.utils.helpers.etag import check_not_modified
 
 router = APIRouter(
     prefix="/evaluation-analysis",
@@ -18,13 +26,42 @@ router = APIRouter(
 @router.get("/{evaluation_id}")
 async def get_analysis(
     request: Request,
+    response: Response,
     evaluation_id: int,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ) -> EvaluationAnalysisPublic:
 
     if request.state.user.role not in [0, 1, 2]:
         raise PermissionDeniedException(custom_message="retrieve this analysis")
 
+    if request.state.user.role != 0:
+        company_id = await get_evaluation_company_id(session, evaluation_id)
+        if company_id != request.state.user.company_id:
+            raise PermissionDeniedException(custom_message="retrieve this analysis")
+
     analysis = await get_evaluation_analysis(session, evaluation_id)
 
+    etag = get_evaluation_analysis_etag(analysis)
+    if not_modified := check_not_modified(request, response, etag):
+        return not_modified
+
     return analysis
+
+
+@router.get("/{evaluation_id}/audio")
+async def get_audio_url(
+    request: Request,
+    evaluation_id: int,
+    session: AsyncSession = Depends(get_read_db),
+) -> EvaluationAudioPublic:
+
+    if request.state.user.role not in [0, 1, 2]:
+        raise PermissionDeniedException(custom_message="retrieve this audio")
+
+    if request.state.user.role != 0:
+        company_id = await get_evaluation_company_id(session, evaluation_id)
+        if company_id != request.state.user.company_id:
+            raise PermissionDeniedException(custom_message="retrieve this audio")
+
+    # El frontend reproduce directo desde R2; la API no transfiere el audio
+    return await get_evaluation_audio_url(session, evaluation_id)
@@ -1,4 +1,5 @@
 import json
+from datetime import datetime
 from typing import Optional
 from fastapi import (
     APIRouter,
@@ -8,7 +9,9 @@ from fastapi import (
     Form,
     Query,
     Request,
+    Response,
 )
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -21,17 +24,21 @@ from app.models.evaluation_model import (
     EvaluationPublic,
     EvaluationUpdate,
     EvaluationsPublic,
+    ExportFormatEnum,
     StatusChangeRequest,
     StatusEnum,
 )
-from app.models.video_model import Video
+from app.models.video_model import Video, VideoCreate
 from app.services.cloudflare_stream_services import get_video_url
 from app.services.evaluation_services import (
     change_evaluation_status,
     create_evaluation,
-    get_evaluation,
+    get_evaluation_company_id,
+    get_evaluation_etag,
+    get_evaluation_public,
     get_evaluations,
     soft_delete_evaluation,
+    stream_evaluations_export,
     update_evaluation,
 )
 from app.services.extract_audio_services import handle_stream_to_audio
@@ -39,8 +46,13 @@ from app.services.video_services import (
     create_video,
     update_video_status,
 )
-from app.utils.deps import check_company_payment_status, get_auth_user
+from app.utils.deps import (
+    check_company_payment_status,
+    get_auth_user,
+    get_tenant_db,
+)
 from app.utils.exeptions import PermissionDeniedException
+from app.utils.helpers.etag import check_not_modified
 
 
 router = APIRouter(
@@ -53,29 +65,17 @@ router = APIRouter(
 @router.get("/")
 async def get_all(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_tenant_db),
     offset: int = 0,
     limit: int = Query(default=10, le=50),
     filter: Optional[str] = None,
     search: Optional[str] = None,
 ) -> EvaluationsPublic:
 
+    # La empresa la filtra RLS en la sesión
     match request.state.user.role:
-        case 0:
+        case 0 | 1 | 2:
             evaluations = await get_evaluations(session, offset, limit, filter, search)
-        case 1:
-            evaluations = await get_evaluations(
-                session, offset, limit, filter, search, request.state.user.company_id
-            )
-        case 2:
-            evaluations = await get_evaluations(
-                session,
-                offset,
-                limit,
-                filter,
-                search,
-                request.state.user.company_id,
-            )
         case 3:
             evaluations = await get_evaluations(
                 session,
@@ -83,8 +83,7 @@ async def get_all(
                 limit,
                 filter,
                 search,
-                request.state.user.company_id,
-                request.state.user.id,
+                user_id=request.state.user.id,
             )
 
     return evaluations
@@ -118,14 +117,49 @@ async def check_video(
     return video
 
 
+@router.get("/export")
+async def export(
+    request: Request,
+    file_format: ExportFormatEnum = Query(default=ExportFormatEnum.CSV, alias="format"),
+    campaign_id: Optional[int] = None,
+    status: Optional[StatusEnum] = None,
+) -> StreamingResponse:
+
+    if request.state.user.role not in [0, 1, 2]:
+        raise PermissionDeniedException(custom_message="export evaluations")
+
+    company_id = None if request.state.user.role == 0 else request.state.user.company_id
+
+    media_types = {
+        ExportFormatEnum.CSV: "text/csv; charset=utf-8",
+        ExportFormatEnum.XLSX: (
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        ),
+    }
+    filename = f"evaluaciones_{datetime.now():%Y%m%d_%H%M%S}.{file_format.value}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    # El XLSX ya es un zip: con Content-Encoding puesto GZipMiddleware no lo
+    # vuelve a comprimir
+    if file_format == ExportFormatEnum.XLSX:
+        headers["Content-Encoding"] = "identity"
+
+    return StreamingResponse(
+        stream_evaluations_export(file_format, company_id, campaign_id, status),
+        media_type=media_types[file_format],
+        headers=headers,
+    )
+
+
 @router.get("/{evaluation_id}")
 async def get_one(
     request: Request,
+    response: Response,
     evaluation_id: int,
     session: AsyncSession = Depends(get_db),
 ) -> EvaluationPublic:
 
-    evaluation = await get_evaluation(session, evaluation_id)
+    evaluation = await get_evaluation_public(session, evaluation_id)
 
     if (
         request.state.user.role != 0
@@ -133,6 +167,10 @@ async def get_one(
     ):
         raise PermissionDeniedException(custom_message="retrieve this evaluation")
 
+    etag = get_evaluation_etag(evaluation)
+    if not_modified := check_not_modified(request, response, etag):
+        return not_modified
+
     return evaluation
 
 
@@ -149,22 +187,20 @@ async def create(
     evaluation_answers: str = Form(...),
 ) -> Evaluation:
 
-    video_url = get_video_url(media_url)
-    video_upload = await create_video(session, video_url, video_title)
+    video = VideoCreate(url=get_video_url(media_url), title=video_title)
 
     parsed_answers = json.loads(evaluation_answers)
     answers_list = [EvaluationAnswerBase(**item) for item in parsed_answers]
 
     evaluation = EvaluationCreate(
         campaigns_id=campaign_id,
-        video_id=video_upload.id,
         user_id=request.state.user.id,
         location=location,
         evaluated_collaborator=evaluated_collaborator,
         evaluation_answers=answers_list,
     )
 
-    evaluation_db = await create_evaluation(session, evaluation)
+    evaluation_db = await create_evaluation(session, evaluation, video)
 
     # Extraer Audio y pasar a una IA
     background_tasks.add_task(
@@ -187,10 +223,10 @@ async def update(
     session: AsyncSession = Depends(get_db),
 ) -> EvaluationPublic:
 
-    db_evaluation = await get_evaluation(session, evaluation_id)
+    company_id = await get_evaluation_company_id(session, evaluation_id)
 
     if request.state.user.role in [1, 2, 3]:
-        if db_evaluation.campaign.company_id != request.state.user.company_id:
+        if company_id != request.state.user.company_id:
             raise PermissionDeniedException(custom_message="update this evaluation")
 
     parsed_answers = json.loads(evaluation_answers)
@@ -220,8 +256,8 @@ async def delete(
 ):
 
     if request.state.user.role in [1, 2, 3]:
-        db_evaluation = await get_evaluation(session, evaluation_id)
-        if db_evaluation.campaign.company_id != request.state.user.company_id:
+        company_id = await get_evaluation_company_id(session, evaluation_id)
+        if company_id != request.state.user.company_id:
             raise PermissionDeniedException(custom_message="delete this evaluation")
 
     await soft_delete_evaluation(session, evaluation_id)
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Response, status
+
+from app.services.health_services import get_readiness
+
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"],
+)
+
+
+@router.get("/live")
+async def live():
+
+    # Sin dependencias: solo confirma que el proceso y su event loop responden
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(response: Response):
+
+    readiness = await get_readiness()
+
+    if readiness["status"] != "ok":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return readiness
@@ -13,6 +13,7 @@ from app.routes import (
     dashboard_router,
     evaluation_analysis_router,
     evaluation_router,
+    metrics_router,
     notification_router,
     survey_router,
     user_router,
@@ -43,3 +44,4 @@ api_router.include_router(cloudflare_webhook_router.router)
 api_router.include_router(evaluation_analysis_router.router)
 api_router.include_router(campaign_goals_evaluator_router.router)
 api_router.include_router(campaign_goals_progress_router.router)
+api_router.include_router(metrics_router.router)
@@ -0,0 +1,31 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import render_metrics
+from app.utils.exeptions import NotFoundException, PermissionDeniedException
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+)
+
+
+@router.get("/", response_class=PlainTextResponse)
+async def get_metrics(authorization: Optional[str] = Header(default=None)):
+
+    # Exporta texto de consultas SQL: sin token configurado no se publica
+    if not settings.METRICS_TOKEN:
+        raise NotFoundException("Metrics not enabled")
+
+    if not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise PermissionDeniedException(custom_message="retrieve metrics")
+
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
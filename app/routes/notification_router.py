@@ -3,14 +3,18 @@ from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
-from app.models.notification_model import NotificationPublic
+from app.models.notification_model import NotificationListItem, NotificationPublic
 from app.services.notification_services import (
     get_notification_count,
     get_notifications,
     mark_as_read,
     soft_delete_notification,
 )
-from app.utils.deps import check_company_payment_status, get_auth_user
+from app.utils.deps import (
+    check_company_payment_status,
+    get_auth_user,
+    get_tenant_db,
+)
 
 
 router = APIRouter(
@@ -22,31 +26,19 @@ router = APIRouter(
 
 @router.get("/")
 async def get_all(
-    request: Request, session: AsyncSession = Depends(get_db)
-) -> List[NotificationPublic]:
+    request: Request, session: AsyncSession = Depends(get_tenant_db)
+) -> List[NotificationListItem]:
 
+    # La empresa la filtra RLS en la sesión
     match request.state.user.role:
-        case 0:
+        case 0 | 1:
             notifications = await get_notifications(session)
 
-        case 1:
-            notifications = await get_notifications(
-                session, request.state.user.company_id
-            )
-
-        case 2:
-            notifications = await get_notifications(
-                session,
-                request.state.user.company_id,
-                request.state.user.role,
-                request.state.user.id,
-            )
-        case 3:
+        case 2 | 3:
             notifications = await get_notifications(
                 session,
-                request.state.user.company_id,
-                request.state.user.role,
-                request.state.user.id,
+                role=request.state.user.role,
+                user_id=request.state.user.id,
             )
 
     return notifications
@@ -55,29 +47,18 @@ async def get_all(
 @router.get("/count")
 async def get_count(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_tenant_db),
 ) -> int:
 
     match request.state.user.role:
-        case 0:
+        case 0 | 1:
             count = await get_notification_count(session)
 
-        case 1:
-            count = await get_notification_count(session, request.state.user.company_id)
-
-        case 2:
-            count = await get_notification_count(
-                session,
-                request.state.user.company_id,
-                request.state.user.role,
-                request.state.user.id,
-            )
-        case 3:
+        case 2 | 3:
             count = await get_notification_count(
                 session,
-                request.state.user.company_id,
-                request.state.user.role,
-                request.state.user.id,
+                role=request.state.user.role,
+                user_id=request.state.user.id,
             )
 
     return count
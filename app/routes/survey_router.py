@@ -1,5 +1,5 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
@@ -8,16 +8,22 @@ from app.models.survey_forms_model import (
     SurveyFormPublic,
     SurveyFormsCreate,
     SurveyFormsPublic,
+    SurveyFormsUpdate,
 )
+from app.services.company_services import get_company
 from app.services.survey_forms_services import (
     create_survey_form,
-    get_form_by_id,
+    export_survey_form,
+    get_form,
+    get_form_etag,
+    get_form_snapshot,
     get_forms_by_company,
     soft_delete_form,
     update_survey_form,
 )
 from app.utils.deps import check_company_payment_status, get_auth_user
-from app.utils.exeptions import PermissionDeniedException
+from app.utils.exeptions import BadRequestException, PermissionDeniedException
+from app.utils.helpers.etag import check_not_modified
 
 
 router = APIRouter(
@@ -51,10 +57,60 @@ async def get_all_forms(
 async def get_one_form(
     form_id: int,
     request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_db),
 ) -> SurveyFormPublic:
 
-    surveyForm = await get_form_by_id(session, form_id, request.state.user.company_id)
+    form = await get_form(session, form_id, request.state.user.company_id)
+
+    # Con la versión basta para responder 304 sin armar el árbol del formulario
+    etag = get_form_etag(form.id, form.version)
+    if not_modified := check_not_modified(request, response, etag):
+        return not_modified
+
+    surveyForm = await get_form_snapshot(session, form)
+
+    return surveyForm
+
+
+@router.get("/{form_id}/export")
+async def export_form(
+    form_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_db),
+) -> SurveyFormsCreate:
+
+    if request.state.user.role not in [0, 1]:
+        raise PermissionDeniedException(custom_message="export a survey form")
+
+    # Superadmin puede exportar plantillas de cualquier empresa
+    company_id = None if request.state.user.role == 0 else request.state.user.company_id
+
+    surveyForm = await export_survey_form(session, form_id, company_id)
+
+    return surveyForm
+
+
+@router.post("/import")
+async def import_form(
+    request: Request,
+    data: SurveyFormsCreate,
+    company_id: Optional[int] = None,
+    session: AsyncSession = Depends(get_db),
+) -> SurveyForm:
+
+    if request.state.user.role not in [0, 1]:
+        raise PermissionDeniedException(custom_message="import a survey form")
+
+    # Solo superadmin puede importar en otra empresa, y debe indicar cuál
+    if request.state.user.role != 0:
+        company_id = request.state.user.company_id
+    elif company_id is None:
+        raise BadRequestException("company_id is required")
+    else:
+        await get_company(session, company_id)
+
+    surveyForm = await create_survey_form(session, company_id, data)
 
     return surveyForm
 
@@ -77,7 +133,7 @@ async def create_form(
 @router.put("/{form_id}")
 async def update_form(
     form_id: int,
-    data: SurveyFormsCreate,
+    data: SurveyFormsUpdate,
     request: Request,
     session: AsyncSession = Depends(get_db),
 ) -> SurveyForm:
@@ -1,9 +1,15 @@
+import json
+import logging
+import shutil
+import tempfile
+from contextlib import ExitStack
 from typing import Optional
-from fastapi import APIRouter, Depends, Request, Query, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, File, Request, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.db import get_db, get_read_db
 from app.models.user_model import (
     UserCreate,
     UserPublic,
@@ -12,19 +18,23 @@ from app.models.user_model import (
     UsersPublic,
 )
 from app.services.users_services import (
+    USER_IMPORT_FORMATS,
     create_user,
     get_user,
     get_user_by_zone,
     get_users,
     get_users_plain,
+    import_users,
     soft_delete_user,
     update_user,
     update_user_me,
 )
 from app.utils.deps import check_company_payment_status, get_auth_user
-from app.utils.exeptions import PermissionDeniedException
+from app.utils.exeptions import BadRequestException, PermissionDeniedException
 from app.utils.helpers.role_checker import check_role_creation_permissions
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/user",
     tags=["User"],
@@ -35,7 +45,7 @@ router = APIRouter(
 @router.get("/")
 async def get_all(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     offset: int = 0,
     limit: int = Query(default=10, le=100),
     filter: Optional[str] = None,
@@ -162,6 +172,58 @@ async def create(
     return save_user
 
 
+@router.post("/import")
+async def import_bulk(
+    request: Request,
+    file: UploadFile = File(...),
+    company_id: Optional[int] = None,
+) -> StreamingResponse:
+
+    if request.state.user.role not in [0, 1]:
+        raise PermissionDeniedException(custom_message="import users")
+
+    # Solo el superadmin puede importar en otra empresa
+    if request.state.user.role == 1:
+        company_id = request.state.user.company_id
+
+    file_format = (file.filename or "").rsplit(".", 1)[-1].lower()
+    file_format = "jsonl" if file_format == "ndjson" else file_format
+
+    if file_format not in USER_IMPORT_FORMATS:
+        raise BadRequestException(
+            f"Unsupported file format, use one of: {', '.join(USER_IMPORT_FORMATS)}"
+        )
+
+    # FastAPI cierra el UploadFile antes de enviar la respuesta por partes: se
+    # copia (en un hilo, puede ir a disco) y el generador pasa a ser su dueño
+    with ExitStack() as stack:
+        upload = stack.enter_context(
+            tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        )
+        await run_in_threadpool(shutil.copyfileobj, file.file, upload, 1024 * 1024)
+        upload.seek(0)
+        owned_upload = stack.pop_all()
+
+    async def progress():
+        with owned_upload:
+            try:
+                async for line in import_users(
+                    upload, file_format, request.state.user.role, company_id
+                ):
+                    yield line
+            except Exception:
+                # La respuesta ya empezó: el error va como última línea
+                logger.exception("User import failed")
+                yield json.dumps({"error": "User import failed"}) + "\n"
+
+    # Sin compresión: GZipMiddleware acumularía las líneas de progreso hasta el final
+    return StreamingResponse(
+        progress(),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "identity"},
+    )
+
+
 @router.put("/{user_id}", response_model=UserPublic)
 async def update_any(
     request: Request,
@@ -1,10 +1,17 @@
 from typing import List
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
 from app.models.zone_model import ZonePublic
-from app.services.zone_services import get_limit_zones, get_zone, get_zones
+from app.services.zone_services import (
+    ZONES_CACHE_CONTROL,
+    get_limit_zones,
+    get_zone,
+    get_zones,
+    get_zones_etag,
+)
 from app.utils.deps import check_company_payment_status, get_auth_user
+from app.utils.helpers.etag import CACHE_CONTROL, check_not_modified
 
 
 router = APIRouter(
@@ -16,29 +23,46 @@ router = APIRouter(
 
 @router.get("/")
 async def get_all(
-    request: Request, session: AsyncSession = Depends(get_db)
+    request: Request, response: Response, session: AsyncSession = Depends(get_db)
 ) -> List[ZonePublic]:
 
+    # El catálogo completo casi no cambia; las asignaciones sí se revalidan
     match request.state.user.role:
         case 0:
-            return await get_zones(session)
+            zones = await get_zones(session)
+            cache_control = ZONES_CACHE_CONTROL
 
         case 1:
-            return await get_zones(session)
+            zones = await get_zones(session)
+            cache_control = ZONES_CACHE_CONTROL
 
         case 2:
-            return await get_limit_zones(session, request.state.user.id)
+            zones = await get_limit_zones(session, request.state.user.id)
+            cache_control = CACHE_CONTROL
 
         case 3:
-            return await get_limit_zones(session, request.state.user.id)
+            zones = await get_limit_zones(session, request.state.user.id)
+            cache_control = CACHE_CONTROL
+
+    etag = get_zones_etag(zones)
+    if not_modified := check_not_modified(request, response, etag, cache_control):
+        return not_modified
+
+    return zones
 
 
 @router.get("/{zone_id}")
 async def get_one(
     zone_id: int,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_db),
 ) -> ZonePublic:
 
     zone = await get_zone(session, zone_id)
 
+    etag = get_zones_etag([zone])
+    if not_modified := check_not_modified(request, response, etag, ZONES_CACHE_CONTROL):
+        return not_modified
+
     return zone
@@ -0,0 +1,27 @@
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+
+# Arranque en producción: python -m app.server
+def main() -> None:
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=settings.SERVER_WORKERS or os.cpu_count() or 1,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        # Tras SIGTERM deja de aceptar conexiones y espera a las que están en
+        # curso; al vencer cancela las tareas que queden
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == "__main__":
+    main()
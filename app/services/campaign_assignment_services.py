@@ -1,11 +1,13 @@
 from datetime import datetime
 from typing import Optional
 from fastapi import Query
+from sqlalchemy import literal, text, union_all
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import and_, func, or_, select
+from sqlmodel import and_, func, or_, select, update
 from sqlalchemy.orm import selectinload
 
-from app.models.campaign_model import Campaign
+from app.models.campaign_model import Campaign, CampaignPublic
 from app.models.campaign_user_model import (
     CampaignUser,
     CampaignUserPublic,
@@ -19,9 +21,10 @@ from app.models.campaign_zone_model import (
 )
 from app.models.user_model import User
 from app.models.user_zone_model import UserZone
-from app.models.zone_model import Zone
+from app.services.zone_services import ensure_zones, get_cached_zone, search_zone_ids
 from app.types.pagination import Pagination
 from app.utils.exeptions import NotFoundException
+from app.utils.helpers.unnest_ids import unnest_ids
 
 
 async def get_assigments_by_user(
@@ -121,15 +124,46 @@ async def get_campaign_user(
 
 
 async def assign_users_to_campaign(
-    session: AsyncSession, campaign_id: int, user_ids: list[int]
-):
-    # Crea nuevas asignaciones
-    assignments = [
-        CampaignUser(campaign_id=campaign_id, user_id=user_id) for user_id in user_ids
-    ]
-    session.add_all(assignments)
+    session: AsyncSession,
+    campaign_id: int,
+    user_ids: list[int],
+    replace: bool = False,
+) -> dict:
+    removed = 0
+
+    # Con replace, se dan de baja las asignaciones que ya no vienen en la lista
+    if replace:
+        result = await session.execute(
+            update(CampaignUser)
+            .where(
+                CampaignUser.campaign_id == campaign_id,
+                CampaignUser.deleted_at == None,
+                CampaignUser.user_id.not_in(user_ids),
+            )
+            .values(deleted_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        removed = result.rowcount
+
+    # Solo se insertan los pares sin asignación activa (índice parcial único)
+    result = await session.execute(
+        insert(CampaignUser)
+        .from_select(
+            ["campaign_id", "user_id"],
+            select(literal(campaign_id), unnest_ids(user_ids)),
+        )
+        .on_conflict_do_nothing(
+            index_elements=["campaign_id", "user_id"],
+            index_where=text("deleted_at IS NULL"),
+        )
+        .returning(CampaignUser.id)
+    )
+    created = len(result.all())
+
     await session.commit()
 
+    return {"created": created, "removed": removed}
+
 
 async def soft_delete_campaign_users(
     session: AsyncSession, asignment_id: int, company_id: Optional[int] = None
@@ -149,6 +183,13 @@ async def soft_delete_campaign_users(
 # Assign Campaign to Zones Service
 
 
+# La zona sale de la caché en memoria en lugar de un JOIN con zones
+def _campaign_zone_public(db_campaign_zone: CampaignZone) -> CampaignZonePublic:
+    return CampaignZonePublic.model_validate(
+        db_campaign_zone, update={"zone": get_cached_zone(db_campaign_zone.zone_id)}
+    )
+
+
 async def get_assigments_by_zones(
     session: AsyncSession,
     offset: int = 0,
@@ -159,12 +200,13 @@ async def get_assigments_by_zones(
     user_id: Optional[int] = None,
 ) -> CampaignZonesPublic:
 
+    await ensure_zones(session)
+
     query = (
         select(CampaignZone, func.count().over().label("total"))
         .join(Campaign, CampaignZone.campaign_id == Campaign.id, isouter=True)
-        .join(Zone, CampaignZone.zone_id == Zone.id, isouter=True)
         .where(CampaignZone.deleted_at == None)
-        .options(selectinload(CampaignZone.zone), selectinload(CampaignZone.campaign))
+        .options(selectinload(CampaignZone.campaign))
     )
 
     if company_id is not None:
@@ -186,7 +228,7 @@ async def get_assigments_by_zones(
     if filter and search:
         match filter:
             case "zone":
-                query = query.where(Zone.name.ilike(f"%{search}%"))
+                query = query.where(CampaignZone.zone_id.in_(search_zone_ids(search)))
 
             case "campaign":
                 query = query.where(Campaign.name.ilike(f"%{search}%"))
@@ -199,23 +241,23 @@ async def get_assigments_by_zones(
     if not db_campaign_zones:
         raise NotFoundException("Campaign by zones not found")
 
-    campaign_users = [row[0] for row in db_campaign_zones]
+    campaign_users = [_campaign_zone_public(row[0]) for row in db_campaign_zones]
     total = db_campaign_zones[0][1] if db_campaign_zones else 0
     pagination = Pagination(first=offset, rows=limit, total=total)
 
     return CampaignZonesPublic(data=campaign_users, pagination=pagination)
 
 
-async def get_campaign_zone(
+async def _get_campaign_zone_entity(
     session: AsyncSession,
     campaign_zone_id: int,
     company_id: Optional[int] = None,
-) -> CampaignZonePublic:
+) -> CampaignZone:
     query = (
         select(CampaignZone)
         .join(Campaign, CampaignZone.campaign_id == Campaign.id, isouter=True)
         .where(CampaignZone.id == campaign_zone_id, CampaignZone.deleted_at == None)
-        .options(selectinload(CampaignZone.campaign), selectinload(CampaignZone.zone))
+        .options(selectinload(CampaignZone.campaign))
     )
 
     if company_id is not None:
@@ -230,15 +272,60 @@ async def get_campaign_zone(
     return db_campaign_zone
 
 
+async def get_campaign_zone(
+    session: AsyncSession,
+    campaign_zone_id: int,
+    company_id: Optional[int] = None,
+) -> CampaignZonePublic:
+    await ensure_zones(session)
+    db_campaign_zone = await _get_campaign_zone_entity(
+        session, campaign_zone_id, company_id
+    )
+
+    return _campaign_zone_public(db_campaign_zone)
+
+
 async def assign_zones_to_campaign(
-    session: AsyncSession, campaign_id: int, zone_ids: list[int]
-):
-    assignments = [
-        CampaignZone(campaign_id=campaign_id, zone_id=zone_id) for zone_id in zone_ids
-    ]
-    session.add_all(assignments)
+    session: AsyncSession,
+    campaign_id: int,
+    zone_ids: list[int],
+    replace: bool = False,
+) -> dict:
+    removed = 0
+
+    # Con replace, se dan de baja las asignaciones que ya no vienen en la lista
+    if replace:
+        result = await session.execute(
+            update(CampaignZone)
+            .where(
+                CampaignZone.campaign_id == campaign_id,
+                CampaignZone.deleted_at == None,
+                CampaignZone.zone_id.not_in(zone_ids),
+            )
+            .values(deleted_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        removed = result.rowcount
+
+    # Solo se insertan los pares sin asignación activa (índice parcial único)
+    result = await session.execute(
+        insert(CampaignZone)
+        .from_select(
+            ["campaign_id", "zone_id"],
+            select(literal(campaign_id), unnest_ids(zone_ids)),
+        )
+        .on_conflict_do_nothing(
+            index_elements=["campaign_id", "zone_id"],
+            index_where=text("deleted_at IS NULL"),
+        )
+        .returning(CampaignZone.id)
+    )
+    created = len(result.all())
+
     await session.commit()
 
+    return {"created": created, "removed": removed}
+
 
 async def soft_delete_campaign_zone(
     session: AsyncSession,
@@ -246,7 +333,9 @@ async def soft_delete_campaign_zone(
     company_id: Optional[int] = None,
 ):
 
-    db_campaign_zone = await get_campaign_zone(session, asignment_id, company_id)
+    db_campaign_zone = await _get_campaign_zone_entity(
+        session, asignment_id, company_id
+    )
 
     db_campaign_zone.deleted_at = datetime.now()
 
@@ -262,42 +351,72 @@ async def get_assiments_campaigns(
     user_id: int,
     company_id: Optional[int] = None,
 ) -> currentAssignedCampaign:
-    query_by_user = (
-        select(CampaignUser)
-        .join(Campaign, CampaignUser.campaign_id == Campaign.id, isouter=True)
-        .where(
-            CampaignUser.user_id == user_id,
-            Campaign.date_end >= datetime.now(),
-            CampaignUser.deleted_at == None,
-        )
-        .options(selectinload(CampaignUser.campaign))
-        .order_by(CampaignUser.id)
+    await ensure_zones(session)
+
+    # Asignaciones directas y por zona en una sola consulta; target_id es el
+    # user_id o el zone_id según el origen
+    user_rows = select(
+        literal("user").label("source"),
+        CampaignUser.id,
+        CampaignUser.campaign_id,
+        CampaignUser.user_id.label("target_id"),
+        CampaignUser.created_at,
+        CampaignUser.updated_at,
+    ).where(CampaignUser.user_id == user_id, CampaignUser.deleted_at == None)
+
+    zone_rows = select(
+        literal("zone").label("source"),
+        CampaignZone.id,
+        CampaignZone.campaign_id,
+        CampaignZone.zone_id.label("target_id"),
+        CampaignZone.created_at,
+        CampaignZone.updated_at,
+    ).where(
+        CampaignZone.zone_id.in_(
+            select(UserZone.zone_id).where(
+                UserZone.user_id == user_id, UserZone.deleted_at == None
+            )
+        ),
+        CampaignZone.deleted_at == None,
     )
-    result_by_user = await session.execute(query_by_user)
-    db_campaigns = result_by_user.scalars().all()
 
-    user_zones = await session.execute(
-        select(UserZone.zone_id).where(
-            UserZone.user_id == user_id, UserZone.deleted_at == None
-        )
+    assignments = union_all(user_rows, zone_rows).subquery()
+
+    query = (
+        select(Campaign, assignments)
+        .join(assignments, assignments.c.campaign_id == Campaign.id)
+        .where(Campaign.date_end >= datetime.now(), Campaign.deleted_at == None)
+        .order_by(assignments.c.id)
     )
-    zone_ids = [row[0] for row in user_zones]
 
-    if not zone_ids:
-        raise NotFoundException("No zones assigned to user")
+    if company_id is not None:
+        query = query.where(Campaign.company_id == company_id)
 
-    query_by_zone = (
-        select(CampaignZone)
-        .join(Campaign, CampaignZone.campaign_id == Campaign.id, isouter=True)
-        .where(
-            CampaignZone.zone_id.in_(zone_ids),
-            Campaign.date_end >= datetime.now(),
-            CampaignZone.deleted_at == None,
-        )
-        .options(selectinload(CampaignZone.campaign), selectinload(CampaignZone.zone))
-        .order_by(CampaignZone.id)
-    )
-    result_by_zone = await session.execute(query_by_zone)
-    db_campaigns_zone = result_by_zone.scalars().all()
+    result = await session.execute(query)
+
+    campaigns = {}
+    by_user, by_zone = [], []
+    for row in result.all():
+        campaign = campaigns.get(row.campaign_id)
+        if campaign is None:
+            campaign = campaigns[row.campaign_id] = CampaignPublic.model_validate(
+                row.Campaign
+            )
+
+        assignment = {
+            "id": row.id,
+            "campaign_id": row.campaign_id,
+            "campaign": campaign,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+            "deleted_at": None,
+        }
+        if row.source == "user":
+            by_user.append(CampaignUserPublic(user_id=row.target_id, **assignment))
+        else:
+            zone = get_cached_zone(row.target_id)
+            by_zone.append(
+                CampaignZonePublic(zone_id=row.target_id, zone=zone, **assignment)
+            )
 
-    return currentAssignedCampaign(by_user=db_campaigns, by_zone=db_campaigns_zone)
+    return currentAssignedCampaign(by_user=by_user, by_zone=by_zone)
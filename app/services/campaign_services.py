@@ -8,14 +8,16 @@ from sqlalchemy.orm import selectinload
 from app.models.campaign_model import (
     Campaign,
     CampaignBase,
+    CampaignListItem,
     CampaignPublic,
     CampaignUpdate,
     CampaignsPublic,
 )
 from app.models.survey_forms_model import SurveyForm
-from app.models.survey_model import SurveySection
+from app.services.survey_forms_services import get_form_snapshot
 from app.types.pagination import Pagination
 from app.utils.exeptions import NotFoundException
+from app.utils.helpers.nest_columns import labeled, nest_columns
 
 
 async def get_campaigns(
@@ -28,8 +30,24 @@ async def get_campaigns(
 ) -> CampaignsPublic:
 
     query = (
-        select(Campaign, func.count().over().label("total"))
-        .options(selectinload(Campaign.survey))
+        select(
+            Campaign.id,
+            Campaign.company_id,
+            Campaign.name,
+            Campaign.objective,
+            Campaign.date_start,
+            Campaign.date_end,
+            Campaign.channel,
+            Campaign.survey_id,
+            Campaign.notes,
+            Campaign.goal,
+            Campaign.created_at,
+            Campaign.updated_at,
+            Campaign.deleted_at,
+            func.count().over().label("total"),
+            *labeled("survey", SurveyForm.id, SurveyForm.title, SurveyForm.version),
+        )
+        .join(SurveyForm, Campaign.survey_id == SurveyForm.id, isouter=True)
         .where(Campaign.company_id == company_id, Campaign.deleted_at == None)
     )
 
@@ -47,26 +65,24 @@ async def get_campaigns(
     query = query.order_by(Campaign.id).offset(offset).limit(limit)
 
     result = await session.execute(query)
-    db_campaigns = result.unique().all()
+    db_campaigns = result.mappings().all()
 
     if not db_campaigns:
         raise NotFoundException("Campaigns not found")
 
-    campaigns = [CampaignPublic.model_validate(row[0]) for row in db_campaigns]
-    total = db_campaigns[0][1] if db_campaigns else 0
+    campaigns = [
+        CampaignListItem.model_validate(nest_columns(row)) for row in db_campaigns
+    ]
+    total = db_campaigns[0]["total"]
     pagination = Pagination(first=offset, rows=limit, total=total)
 
     return CampaignsPublic(data=campaigns, pagination=pagination)
 
 
-async def get_campaign(session: AsyncSession, campaign_id: int) -> CampaignPublic:
+async def get_campaign(session: AsyncSession, campaign_id: int) -> Campaign:
     query = (
         select(Campaign)
-        .options(
-            selectinload(Campaign.survey)
-            .selectinload(SurveyForm.sections)
-            .selectinload(SurveySection.aspects)
-        )
+        .options(selectinload(Campaign.survey))
         .where(Campaign.id == campaign_id, Campaign.deleted_at == None)
     )
 
@@ -79,6 +95,19 @@ async def get_campaign(session: AsyncSession, campaign_id: int) -> CampaignPubli
     return db_campaign
 
 
+async def get_campaign_public(
+    session: AsyncSession, campaign_id: int
+) -> CampaignPublic:
+    db_campaign = await get_campaign(session, campaign_id)
+
+    campaign = CampaignPublic.model_validate(db_campaign)
+
+    if db_campaign.survey is not None:
+        campaign.survey = await get_form_snapshot(session, db_campaign.survey)
+
+    return campaign
+
+
 async def create_campaign(
     session: AsyncSession, campaign: CampaignBase
 ) -> CampaignPublic:
@@ -1,15 +1,182 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
 import boto3
+from botocore.config import Config
+from fastapi.concurrency import run_in_threadpool
+
 from app.core.config import settings
 
+# R2/S3 exige partes de al menos 5 MB salvo la última
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+# Las URLs firmadas se reutilizan hasta que les quede menos de este margen
+PRESIGNED_URL_MIN_REMAINING = 60
+
+_client = None
+_client_lock = threading.Lock()
+
+# Clave R2 -> (vence, url, expira en UTC)
+_presigned_urls: dict[str, tuple[float, str, datetime]] = {}
+
+
+# Cliente compartido: los clientes de boto3 son thread-safe, las sesiones no
+def init_r2_client():
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            session = boto3.Session()
+            _client = session.client(
+                service_name="s3",
+                region_name="enam",
+                aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+                endpoint_url=settings.R2_ENDPOINT_URL,
+                config=Config(
+                    max_pool_connections=settings.R2_MAX_POOL_CONNECTIONS,
+                    retries={"max_attempts": 3, "mode": "standard"},
+                ),
+            )
+    return _client
+
 
-def r2_upload(archivo_local, nombre_objetivo):
-    session = boto3.Session()
-    s3 = session.client(
-        service_name="s3",
-        region_name="enam",
-        aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-        endpoint_url=settings.R2_ENDPOINT_URL,
+def get_r2_client():
+    return _client or init_r2_client()
+
+
+def close_r2_client():
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def r2_presigned_url(key: str) -> tuple[str, datetime]:
+    now = time.monotonic()
+    cached = _presigned_urls.get(key)
+    if cached is not None and cached[0] - now > PRESIGNED_URL_MIN_REMAINING:
+        return cached[1], cached[2]
+
+    # Firmar es local (sin red); la caché da la misma URL y el navegador la reutiliza
+    ttl = settings.R2_PRESIGNED_URL_TTL
+    url = get_r2_client().generate_presigned_url(
+        "get_object",
+        Params={"Bucket": settings.R2_BUCKET, "Key": key},
+        ExpiresIn=ttl,
     )
-    with open(archivo_local, "rb") as data:
-        s3.upload_fileobj(data, settings.R2_BUCKET, nombre_objetivo)
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+
+    for cached_key, entry in list(_presigned_urls.items()):
+        if entry[0] <= now:
+            _presigned_urls.pop(cached_key, None)
+    _presigned_urls[key] = (now + ttl, url, expires_at)
+
+    return url, expires_at
+
+
+async def r2_upload_stream(
+    chunks: AsyncIterator[bytes], key: str, content_type: str | None = None
+) -> int:
+    client = get_r2_client()
+    extra = {"ContentType": content_type} if content_type else {}
+    part_size = max(settings.R2_MULTIPART_CHUNKSIZE, MIN_PART_SIZE)
+    buffer = bytearray()
+    size = 0
+    upload_id = None
+    parts: list[dict] = []
+    part_number = 0
+    pending: set[asyncio.Task] = set()
+
+    async def upload_part(number: int, body: bytes):
+        response = await run_in_threadpool(
+            client.upload_part,
+            Bucket=settings.R2_BUCKET,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=body,
+        )
+        parts.append({"PartNumber": number, "ETag": response["ETag"]})
+
+    async def flush(body: bytes):
+        nonlocal part_number
+
+        # Como mucho R2_MAX_CONCURRENCY partes en memoria y en vuelo
+        while len(pending) >= settings.R2_MAX_CONCURRENCY:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            for task in done:
+                task.result()
+
+        part_number += 1
+        pending.add(asyncio.create_task(upload_part(part_number, body)))
+
+    try:
+        async for chunk in chunks:
+            buffer.extend(chunk)
+            size += len(chunk)
+
+            if upload_id is None and len(buffer) < settings.R2_MULTIPART_THRESHOLD:
+                continue
+
+            if upload_id is None:
+                response = await run_in_threadpool(
+                    client.create_multipart_upload,
+                    Bucket=settings.R2_BUCKET,
+                    Key=key,
+                    **extra,
+                )
+                upload_id = response["UploadId"]
+
+            while len(buffer) >= part_size:
+                await flush(bytes(buffer[:part_size]))
+                del buffer[:part_size]
+
+        # Archivos pequeños: una sola petición
+        if upload_id is None:
+            await run_in_threadpool(
+                client.put_object,
+                Bucket=settings.R2_BUCKET,
+                Key=key,
+                Body=bytes(buffer),
+                **extra,
+            )
+            return size
+
+        if buffer:
+            await flush(bytes(buffer))
+        await asyncio.gather(*pending)
+
+        await run_in_threadpool(
+            client.complete_multipart_upload,
+            Bucket=settings.R2_BUCKET,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+        )
+        return size
+
+    except BaseException:
+        # Detiene también al productor (p. ej. el ffmpeg de la extracción)
+        if hasattr(chunks, "aclose"):
+            await chunks.aclose()
+
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        # Sin esto las partes subidas quedan cobrándose en el bucket
+        if upload_id is not None:
+            await run_in_threadpool(
+                client.abort_multipart_upload,
+                Bucket=settings.R2_BUCKET,
+                Key=key,
+                UploadId=upload_id,
+            )
+        raise
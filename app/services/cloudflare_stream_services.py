@@ -1,8 +1,11 @@
 import asyncio
+import logging
 import random
-from fastapi import logger
 import httpx
 from app.core.config import settings
+from app.core.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
 
 
 # Construir URL de Cloudflare Stream
@@ -17,22 +20,24 @@ def get_video_url_download(uid: str) -> str:
 async def resolve_video_url(uid: str) -> str:
     url = get_video_url_download(uid)
 
-    async with httpx.AsyncClient(follow_redirects=True, timeout=20.0) as client:
-        try:
-            # HEAD evita descargar el archivo, pero sigue redirecciones
-            response = await client.head(url, allow_redirects=True)
-            final_url = str(response.url)
-
-            # Verifica que haya sido redirigido
-            if str(response.url) == url:
-                logger.error(
-                    "No se pudo resolver la URL del video, la URL final es la misma que la original."
-                )
+    try:
+        # HEAD evita descargar el archivo, pero sigue redirecciones
+        response = await get_http_client().head(
+            url, follow_redirects=True, timeout=20.0
+        )
+        final_url = str(response.url)
 
-            return final_url
+        # Verifica que haya sido redirigido
+        if str(response.url) == url:
+            logger.error("Video URL was not redirected", extra={"video_uid": uid})
 
-        except httpx.HTTPError as e:
-            logger.error("Error al resolver URL del video: %s", str(e))
+        return final_url
+
+    except httpx.HTTPError as e:
+        logger.error(
+            "Video URL resolution failed",
+            extra={"video_uid": uid, "error": str(e)},
+        )
 
 
 async def wait_until_ready_to_stream(
@@ -45,23 +50,38 @@ async def wait_until_ready_to_stream(
     }
 
     for intento in range(max_retries):
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-                if data.get("result", {}).get("readyToStream") is True:
-                    print(f"✅ Video listo para streaming (intento {intento + 1})")
-                    return True
-                else:
-                    print(f"⏳ Aún no está listo (intento {intento + 1})")
-            except Exception as e:
-                print(f"⚠️ Error al verificar estado de stream: {e}")
+        try:
+            response = await get_http_client().get(url, headers=headers)
+            response.raise_for_status()
+            data = response.json()
+            if data.get("result", {}).get("readyToStream") is True:
+                logger.info(
+                    "Video ready to stream",
+                    extra={"video_uid": video_uid, "attempt": intento + 1},
+                )
+                return True
+
+            logger.debug(
+                "Video not ready yet",
+                extra={"video_uid": video_uid, "attempt": intento + 1},
+            )
+        except Exception as e:
+            logger.warning(
+                "Stream status check failed",
+                extra={
+                    "video_uid": video_uid,
+                    "attempt": intento + 1,
+                    "error": str(e),
+                },
+            )
 
         wait_time = wait_seconds * (2**intento) + random.uniform(0, 1)
         await asyncio.sleep(wait_time)
 
-    print("❌ Tiempo de espera agotado: el video no está listo para streaming.")
+    logger.error(
+        "Video not ready to stream after retries",
+        extra={"video_uid": video_uid, "attempts": max_retries},
+    )
     return False
 
 
@@ -72,9 +92,8 @@ async def enable_download(video_uid: str):
         "Content-Type": "application/json",
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers)
-        response.raise_for_status()
+    response = await get_http_client().post(url, headers=headers)
+    response.raise_for_status()
 
 
 async def get_download_status(video_uid: str):
@@ -84,9 +103,8 @@ async def get_download_status(video_uid: str):
         "Content-Type": "application/json",
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        result = data.get("result", {}).get("default", {})
-        return result.get("status"), result.get("url")
+    response = await get_http_client().get(url, headers=headers)
+    response.raise_for_status()
+    data = response.json()
+    result = data.get("result", {}).get("default", {})
+    return result.get("status"), result.get("url")
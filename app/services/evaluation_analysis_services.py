@@ -8,8 +8,11 @@ from app.models.evaluation_analysis_model import (
     EvaluationAnalysis,
     EvaluationAnalysisBase,
     EvaluationAnalysisPublic,
+    EvaluationAudioPublic,
 )
+from app.services.cloudflare_rs_services import r2_presigned_url
 from app.utils.exeptions import NotFoundException
+from app.utils.helpers.etag import make_etag
 
 
 async def get_evaluation_analysis(
@@ -30,6 +33,10 @@ async def get_evaluation_analysis(
     return db_evaluation_analysis
 
 
+def get_evaluation_analysis_etag(analysis: EvaluationAnalysisPublic) -> str:
+    return make_etag("evaluation-analysis", analysis.id, analysis.updated_at)
+
+
 async def create_evaluation_analysis(
     session: AsyncSession, evaluation_analysis: EvaluationAnalysisBase
 ) -> EvaluationAnalysisPublic:
@@ -42,6 +49,25 @@ async def create_evaluation_analysis(
     return db_evaluation_analysis
 
 
+async def get_evaluation_audio_url(
+    session: AsyncSession, evaluation_id: int
+) -> EvaluationAudioPublic:
+
+    query = select(EvaluationAnalysis.audio_key).where(
+        EvaluationAnalysis.evaluation_id == evaluation_id,
+        EvaluationAnalysis.deleted_at == None,
+        EvaluationAnalysis.audio_key != None,
+    )
+    audio_key = await session.scalar(query)
+
+    if not audio_key:
+        raise NotFoundException("Evaluation audio not found")
+
+    url, expires_at = r2_presigned_url(audio_key)
+
+    return EvaluationAudioPublic(url=url, expires_at=expires_at)
+
+
 async def soft_delete_evaluation_analysis(
     session: AsyncSession, evaluation_analysis_id: int
 ) -> EvaluationAnalysisPublic:
@@ -80,3 +106,43 @@ def split_analysis(response: str):
 
         return executive, operative
     return response, None
+
+
+OPERATIVE_SCORES = ("IOC", "IRD", "CES")
+OPERATIVE_QUALITY = (
+    "saludo",
+    "identificacion",
+    "ofrecimiento",
+    "cierre",
+    "valor_agregado",
+)
+
+
+def parse_operative_kpis(operative_view: str | None) -> dict:
+    # La vista operativa la genera el modelo: puede faltar o venir incompleta
+    try:
+        data = json.loads(operative_view) if operative_view else {}
+    except ValueError:
+        data = {}
+
+    if not isinstance(data, dict):
+        data = {}
+
+    kpis = {}
+    for name in OPERATIVE_SCORES:
+        score = data.get(name)
+        kpis[name.lower()] = score.get("score") if isinstance(score, dict) else None
+
+    quality = data.get("Calidad")
+    quality = quality if isinstance(quality, dict) else {}
+    for name in OPERATIVE_QUALITY:
+        kpis[f"calidad_{name}"] = quality.get(name)
+
+    actions = data.get("acciones_sugeridas")
+    kpis["acciones_sugeridas"] = (
+        "; ".join(str(action) for action in actions)
+        if isinstance(actions, list)
+        else None
+    )
+
+    return kpis
@@ -1,27 +1,46 @@
 import datetime
-from typing import Optional
+from enum import Enum
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import Boolean, Integer, case, cast, column, values
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import and_, func, or_, select
+from sqlmodel import and_, func, insert, or_, select, update
 from sqlalchemy.orm import selectinload
 
+from app.core.db import AsyncReadSessionLocal
 from app.models.campaign_model import Campaign
+from app.models.evaluation_analysis_model import EvaluationAnalysis
 from app.models.evaluation_model import (
     Evaluation,
     EvaluationAnswer,
+    EvaluationAnswerUpdate,
     EvaluationCreate,
+    EvaluationListItem,
     EvaluationPublic,
     EvaluationUpdate,
     EvaluationsPublic,
+    ExportFormatEnum,
     StatusChangeRequest,
     StatusEnum,
 )
 from app.models.notification_model import NotificationBase
-from app.models.survey_forms_model import SurveyForm
-from app.models.survey_model import SurveySection
+from app.models.survey_model import SurveyAspect, SurveySection
 from app.models.user_model import User
+from app.models.video_model import Video, VideoCreate
+from app.services.evaluation_analysis_services import (
+    OPERATIVE_QUALITY,
+    OPERATIVE_SCORES,
+    parse_operative_kpis,
+)
 from app.services.notification_services import create_notification
+from app.services.survey_forms_services import get_form_snapshot
 from app.types.pagination import Pagination
-from app.utils.exeptions import NotFoundException
+from app.utils.exeptions import BadRequestException, NotFoundException
+from app.utils.helpers.csv_stream import CsvStreamWriter
+from app.utils.helpers.etag import make_etag
+from app.utils.helpers.nest_columns import labeled, nest_columns
+from app.utils.helpers.xlsx_stream import XlsxStreamWriter
+
+ANSWER_UPDATE_FIELDS = ("value_number", "value_boolean", "comment")
 
 
 async def get_evaluations(
@@ -34,13 +53,30 @@ async def get_evaluations(
     user_id: Optional[int] = None,
 ) -> EvaluationsPublic:
 
-    query = (
-        select(Evaluation, func.count().over().label("total"))
-        .join(Campaign, Evaluation.campaigns_id == Campaign.id, isouter=True)
-        .join(User, Evaluation.user_id == User.id, isouter=True)
-        .options(selectinload(Evaluation.campaign), selectinload(Evaluation.user))
-        .where(Evaluation.deleted_at == None)
-    )
+    query = select(
+        Evaluation.id,
+        Evaluation.campaigns_id,
+        Evaluation.video_id,
+        Evaluation.user_id,
+        Evaluation.location,
+        Evaluation.evaluated_collaborator,
+        Evaluation.status,
+        Evaluation.visited_zones,
+        Evaluation.created_at,
+        Evaluation.updated_at,
+        Evaluation.deleted_at,
+        func.count().over().label("total"),
+    ).where(Evaluation.deleted_at == None)
+
+    # En sesiones por empresa (RLS) no llega company_id: solo se une lo que se
+    # filtra
+    search_by = filter if search else None
+    if company_id is not None or search_by == "campaign":
+        query = query.join(
+            Campaign, Evaluation.campaigns_id == Campaign.id, isouter=True
+        )
+    if search_by == "evaluator":
+        query = query.join(User, Evaluation.user_id == User.id, isouter=True)
 
     if company_id is not None:
         query = query.where(Campaign.company_id == company_id)
@@ -72,22 +108,45 @@ async def get_evaluations(
                         )
                     )
 
-    query = query.order_by(Evaluation.id).offset(offset).limit(limit)
+    page = query.order_by(Evaluation.id).offset(offset).limit(limit).subquery()
+
+    # Campaña y evaluador se unen solo a la página, no a todas las filas contadas
+    query = (
+        select(
+            page,
+            *labeled(
+                "campaign",
+                Campaign.id,
+                Campaign.name,
+                Campaign.channel,
+                Campaign.date_start,
+                Campaign.date_end,
+            ),
+            *labeled(
+                "user", User.id, User.first_name, User.last_name, User.email, User.role
+            ),
+        )
+        .join(Campaign, page.c.campaigns_id == Campaign.id, isouter=True)
+        .join(User, page.c.user_id == User.id, isouter=True)
+        .order_by(page.c.id)
+    )
 
     result = await session.execute(query)
-    db_evaluations = result.unique().all()
+    db_evaluations = result.mappings().all()
 
     if not db_evaluations:
         raise NotFoundException("Evaluations not found")
 
-    evaluations = [row[0] for row in db_evaluations]
-    total = db_evaluations[0][1] if db_evaluations else 0
+    evaluations = [
+        EvaluationListItem.model_validate(nest_columns(row)) for row in db_evaluations
+    ]
+    total = db_evaluations[0]["total"]
     pagination = Pagination(first=offset, rows=limit, total=total)
 
     return EvaluationsPublic(data=evaluations, pagination=pagination)
 
 
-async def get_evaluation(session: AsyncSession, evaluation_id: int) -> EvaluationPublic:
+async def get_evaluation(session: AsyncSession, evaluation_id: int) -> Evaluation:
 
     query = (
         select(Evaluation)
@@ -95,10 +154,7 @@ async def get_evaluation(session: AsyncSession, evaluation_id: int) -> Evaluatio
         .options(
             selectinload(Evaluation.evaluation_answers),
             selectinload(Evaluation.video),
-            selectinload(Evaluation.campaign)
-            .selectinload(Campaign.survey)
-            .selectinload(SurveyForm.sections)
-            .selectinload(SurveySection.aspects),
+            selectinload(Evaluation.campaign).selectinload(Campaign.survey),
         )
     )
 
@@ -111,6 +167,41 @@ async def get_evaluation(session: AsyncSession, evaluation_id: int) -> Evaluatio
     return db_evaluation
 
 
+async def get_evaluation_public(
+    session: AsyncSession, evaluation_id: int
+) -> EvaluationPublic:
+    db_evaluation = await get_evaluation(session, evaluation_id)
+
+    evaluation = EvaluationPublic.model_validate(db_evaluation)
+
+    if db_evaluation.campaign is not None and db_evaluation.campaign.survey is not None:
+        evaluation.campaign.survey = await get_form_snapshot(
+            session, db_evaluation.campaign.survey
+        )
+
+    return evaluation
+
+
+def get_evaluation_etag(evaluation: EvaluationPublic) -> str:
+    # Cambia si cambia la evaluación, alguna respuesta, la campaña, el evaluador
+    # o la versión del formulario
+    answers = evaluation.evaluation_answers or []
+    campaign = evaluation.campaign
+    return make_etag(
+        "evaluation",
+        evaluation.id,
+        evaluation.updated_at,
+        evaluation.video_id,
+        len(answers),
+        max(
+            (answer.updated_at for answer in answers if answer.updated_at), default=None
+        ),
+        campaign and campaign.updated_at,
+        campaign and campaign.survey and campaign.survey.version,
+        evaluation.user and evaluation.user.updated_at,
+    )
+
+
 async def get_evaluation_answer(
     session: AsyncSession, evaluation_answer_id: int
 ) -> EvaluationAnswer:
@@ -129,55 +220,149 @@ async def get_evaluation_answer(
 
 
 async def create_evaluation(
-    session: AsyncSession, evaluation: EvaluationCreate
+    session: AsyncSession,
+    evaluation: EvaluationCreate,
+    video: Optional[VideoCreate] = None,
 ) -> Evaluation:
 
+    # Video, evaluación y respuestas se guardan en una sola transacción
+    if video is not None:
+        db_video = Video(**video.model_dump())
+        session.add(db_video)
+        await session.flush()
+        evaluation.video_id = db_video.id
+
     db_evaluation = Evaluation(**evaluation.model_dump(exclude={"evaluation_answers"}))
 
     session.add(db_evaluation)
-    await session.commit()
-    await session.refresh(db_evaluation)
-
-    db_answers = []
-    for answer in evaluation.evaluation_answers:
-        db_answer = EvaluationAnswer(
-            **answer.model_dump(exclude={"evaluation_id"}),
-            evaluation_id=db_evaluation.id,
+    await session.flush()
+
+    if evaluation.evaluation_answers:
+        # INSERT multi-fila: una sola sentencia para todas las respuestas
+        await session.execute(
+            insert(EvaluationAnswer),
+            [
+                {
+                    **answer.model_dump(exclude={"evaluation_id"}),
+                    "evaluation_id": db_evaluation.id,
+                }
+                for answer in evaluation.evaluation_answers
+            ],
         )
-        session.add(db_answer)
-        db_answers.append(db_answer)
 
     await session.commit()
 
     return db_evaluation
 
 
+async def get_evaluation_company_id(session: AsyncSession, evaluation_id: int) -> int:
+    query = (
+        select(Campaign.company_id)
+        .join(Evaluation, Evaluation.campaigns_id == Campaign.id)
+        .where(Evaluation.id == evaluation_id, Evaluation.deleted_at == None)
+    )
+
+    result = await session.execute(query)
+    row = result.first()
+
+    if not row:
+        raise NotFoundException("Evaluation not found")
+
+    return row[0]
+
+
+async def update_evaluation_answers(
+    session: AsyncSession,
+    evaluation_id: int,
+    answers: List[EvaluationAnswerUpdate],
+) -> None:
+    # Con ids repetidos el valor aplicado dependería del orden de las filas
+    answer_ids = [answer.id for answer in answers]
+    if len(set(answer_ids)) != len(answer_ids):
+        raise BadRequestException("Duplicated evaluation answer ids")
+
+    table = EvaluationAnswer.__table__
+
+    # Cada fila lleva el valor y un flag que indica si el campo fue enviado,
+    # para conservar la semántica de exclude_unset en un solo UPDATE
+    data = values(
+        column("id", Integer),
+        *(column(field, table.c[field].type) for field in ANSWER_UPDATE_FIELDS),
+        *(column(f"{field}_set", Boolean) for field in ANSWER_UPDATE_FIELDS),
+        name="data",
+    ).data(
+        [
+            (
+                answer.id,
+                *(getattr(answer, field) for field in ANSWER_UPDATE_FIELDS),
+                *(field in answer.model_fields_set for field in ANSWER_UPDATE_FIELDS),
+            )
+            for answer in answers
+        ]
+    )
+
+    query = (
+        update(EvaluationAnswer)
+        .where(
+            EvaluationAnswer.id == data.c.id,
+            EvaluationAnswer.evaluation_id == evaluation_id,
+            EvaluationAnswer.deleted_at == None,
+        )
+        .values(
+            {
+                field: case(
+                    (
+                        data.c[f"{field}_set"],
+                        cast(data.c[field], table.c[field].type),
+                    ),
+                    else_=getattr(EvaluationAnswer, field),
+                )
+                for field in ANSWER_UPDATE_FIELDS
+            }
+        )
+        .returning(EvaluationAnswer.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    result = await session.execute(query)
+    updated_ids = set(result.scalars().all())
+
+    # Toda respuesta enviada debe pertenecer a la evaluación
+    if updated_ids != set(answer_ids):
+        await session.rollback()
+        raise NotFoundException("Evaluation answer not found")
+
+
 async def update_evaluation(
     session: AsyncSession, evaluation_id: int, evaluation_update: EvaluationUpdate
-) -> Evaluation:
-    db_evaluation = await get_evaluation(session, evaluation_id)
-
+) -> EvaluationPublic:
     evaluation_update.status = StatusEnum.UPDATED
 
     evaluation_data = evaluation_update.model_dump(
         exclude={"evaluation_answers"}, exclude_unset=True
     )
 
-    db_evaluation.sqlmodel_update(evaluation_data)
-    session.add(db_evaluation)
+    query = (
+        update(Evaluation)
+        .where(Evaluation.id == evaluation_id, Evaluation.deleted_at == None)
+        .values(**evaluation_data)
+        .returning(Evaluation.id)
+    )
 
-    if evaluation_update.evaluation_answers:
-        for answer in evaluation_update.evaluation_answers:
-            db_answer = await get_evaluation_answer(session, answer.id)
-            answer_data = answer.model_dump(exclude_unset=True)
+    # Solo el id: una entidad del RETURNING quedaría en la sesión sin relaciones
+    # y la recarga del final la reutilizaría
+    result = await session.execute(query)
+    if result.scalar_one_or_none() is None:
+        raise NotFoundException("Evaluation not found")
 
-            db_answer.sqlmodel_update(answer_data)
-            session.add(db_answer)
+    if evaluation_update.evaluation_answers:
+        await update_evaluation_answers(
+            session, evaluation_id, evaluation_update.evaluation_answers
+        )
 
     await session.commit()
-    await session.refresh(db_evaluation)
 
-    return db_evaluation
+    return await get_evaluation_public(session, evaluation_id)
 
 
 async def change_evaluation_status(
@@ -214,3 +399,130 @@ async def soft_delete_evaluation(
     await session.refresh(db_evaluation)
 
     return db_evaluation
+
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    "evaluation_id",
+    "created_at",
+    "status",
+    "campaign",
+    "evaluator",
+    "evaluated_collaborator",
+    "location",
+    "section",
+    "aspect",
+    "aspect_type",
+    "value_number",
+    "value_boolean",
+    "comment",
+    *(name.lower() for name in OPERATIVE_SCORES),
+    *(f"calidad_{name}" for name in OPERATIVE_QUALITY),
+    "acciones_sugeridas",
+)
+
+
+def _export_query(
+    company_id: Optional[int] = None,
+    campaign_id: Optional[int] = None,
+    status: Optional[StatusEnum] = None,
+):
+    # Último análisis vigente por evaluación
+    analysis = (
+        select(EvaluationAnalysis.evaluation_id, EvaluationAnalysis.operative_view)
+        .where(EvaluationAnalysis.deleted_at == None)
+        .distinct(EvaluationAnalysis.evaluation_id)
+        .order_by(EvaluationAnalysis.evaluation_id, EvaluationAnalysis.id.desc())
+        .subquery()
+    )
+
+    answer_order = (SurveySection.order, SurveyAspect.order, EvaluationAnswer.id)
+
+    # La vista operativa solo viaja en la primera fila de cada evaluación
+    first_row = (
+        func.row_number().over(partition_by=Evaluation.id, order_by=answer_order) == 1
+    )
+
+    query = (
+        select(
+            Evaluation.id,
+            Evaluation.created_at,
+            Evaluation.status,
+            Campaign.name,
+            func.concat_ws(" ", User.first_name, User.last_name),
+            Evaluation.evaluated_collaborator,
+            Evaluation.location,
+            SurveySection.name,
+            SurveyAspect.description,
+            SurveyAspect.type,
+            EvaluationAnswer.value_number,
+            EvaluationAnswer.value_boolean,
+            EvaluationAnswer.comment,
+            case((first_row, analysis.c.operative_view)),
+        )
+        .join(Campaign, Evaluation.campaigns_id == Campaign.id)
+        .join(User, Evaluation.user_id == User.id, isouter=True)
+        .join(
+            EvaluationAnswer,
+            and_(
+                EvaluationAnswer.evaluation_id == Evaluation.id,
+                EvaluationAnswer.deleted_at == None,
+            ),
+            isouter=True,
+        )
+        .join(SurveyAspect, EvaluationAnswer.aspect_id == SurveyAspect.id, isouter=True)
+        .join(SurveySection, SurveyAspect.section_id == SurveySection.id, isouter=True)
+        .join(analysis, analysis.c.evaluation_id == Evaluation.id, isouter=True)
+        .where(Evaluation.deleted_at == None)
+        .order_by(Evaluation.id, *answer_order)
+    )
+
+    if company_id is not None:
+        query = query.where(Campaign.company_id == company_id)
+
+    if campaign_id is not None:
+        query = query.where(Evaluation.campaigns_id == campaign_id)
+
+    if status is not None:
+        query = query.where(Evaluation.status == status)
+
+    return query
+
+
+async def stream_evaluations_export(
+    file_format: ExportFormatEnum,
+    company_id: Optional[int] = None,
+    campaign_id: Optional[int] = None,
+    status: Optional[StatusEnum] = None,
+) -> AsyncIterator[bytes]:
+    query = _export_query(company_id, campaign_id, status)
+
+    writer = (
+        XlsxStreamWriter("Evaluaciones")
+        if file_format == ExportFormatEnum.XLSX
+        else CsvStreamWriter()
+    )
+    yield writer.write_rows([EXPORT_COLUMNS])
+
+    current_id, kpis = None, {}
+
+    # Sesión propia: la del request se cierra antes de enviar la respuesta
+    async with AsyncReadSessionLocal() as session:
+        # Cursor del lado del servidor, se leen lotes de EXPORT_BATCH_SIZE filas
+        result = await session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        async for partition in result.partitions():
+            rows = []
+            for *cells, operative_view in partition:
+                if cells[0] != current_id:
+                    current_id, kpis = cells[0], parse_operative_kpis(operative_view)
+
+                cells = [v.value if isinstance(v, Enum) else v for v in cells]
+                rows.append([*cells, *kpis.values()])
+
+            yield writer.write_rows(rows)
+
+    yield writer.close()
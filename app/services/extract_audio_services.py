@@ -1,42 +1,126 @@
 import asyncio
+import logging
 import os
 import random
 import tempfile
 import time
 import uuid
+from contextlib import contextmanager
+
+from typing import AsyncIterator
 
-import httpx
-from moviepy import VideoFileClip
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.concurrency import run_in_threadpool
 
-from app.core.db import get_db
+from app.core.http_client import get_http_client
+from app.core.metrics import (
+    PIPELINE_DOWNLOAD_THROUGHPUT,
+    PIPELINE_IN_FLIGHT,
+    PIPELINE_STAGE_DURATION,
+)
 from app.models.evaluation_analysis_model import EvaluationAnalysisBase
 from app.services.evaluation_analysis_services import (
     create_evaluation_analysis,
     split_analysis,
 )
-from app.services.cloudflare_rs_services import r2_upload
+from app.services.cloudflare_rs_services import r2_upload_stream
 from app.services.cloudflare_stream_services import (
     enable_download,
     get_download_status,
     wait_until_ready_to_stream,
 )
-from app.services.openai_services import audio_analysis
+from app.services.openai_services import analyze_transcription, transcribe_audio
+
+logger = logging.getLogger(__name__)
+
+AUDIO_CHUNK_SIZE = 256 * 1024
+
+# Análisis en curso en este proceso: id -> inicio (monotonic). Corren como
+# BackgroundTasks, así que esta es la cola que ve /health/ready
+_running_analyses: dict[str, float] = {}
+
 
+def analysis_queue() -> tuple[int, float]:
+    now = time.monotonic()
+    started = list(_running_analyses.values())
+    return len(started), max((now - start for start in started), default=0.0)
 
-async def download_video(url: str, ruta_destino: str):
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        async with client.stream("GET", url) as response:
-            response.raise_for_status()
-            with open(ruta_destino, "wb") as f:
-                async for chunk in response.aiter_bytes():
-                    f.write(chunk)
 
+@contextmanager
+def pipeline_stage(stage: str, **tags):
+    # El bloque puede agregar datos (bytes, status) al diccionario que recibe
+    info = {}
+    start = time.perf_counter()
+    status = "ok"
 
-def extract_audio(video_path: str, audio_path: str):
-    with VideoFileClip(video_path) as clip:
-        clip.audio.write_audiofile(audio_path)
+    try:
+        yield info
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        status = info.pop("status", status)
+
+        PIPELINE_STAGE_DURATION.observe(elapsed, stage=stage, status=status)
+        logger.info(
+            "Pipeline stage finished",
+            extra={
+                "stage": stage,
+                "status": status,
+                "duration": round(elapsed, 3),
+                **tags,
+                **info,
+            },
+        )
+
+
+async def download_video(url: str, ruta_destino: str) -> int:
+    size = 0
+    client = get_http_client()
+    async with client.stream("GET", url, follow_redirects=True) as response:
+        response.raise_for_status()
+        with open(ruta_destino, "wb") as f:
+            async for chunk in response.aiter_bytes():
+                f.write(chunk)
+                size += len(chunk)
+    return size
+
+
+async def extract_audio(video_path: str) -> AsyncIterator[bytes]:
+    # moviepy solo aporta la ruta de ffmpeg; se importa al extraer, no al arrancar
+    from moviepy.config import FFMPEG_BINARY
+
+    # Mismo MP3 que generaba moviepy, pero por stdout y sin archivo intermedio
+    process = await asyncio.create_subprocess_exec(
+        FFMPEG_BINARY,
+        "-loglevel",
+        "error",
+        "-i",
+        video_path,
+        "-vn",
+        "-acodec",
+        "libmp3lame",
+        "-ar",
+        "44100",
+        "-f",
+        "mp3",
+        "pipe:1",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    try:
+        while chunk := await process.stdout.read(AUDIO_CHUNK_SIZE):
+            yield chunk
+
+        stderr = await process.stderr.read()
+        if await process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace')}")
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
 
 
 async def wait_and_download_video(
@@ -44,24 +128,42 @@ async def wait_and_download_video(
 ):
     for intento in range(max_retries):
         status, url = await get_download_status(video_uid)
-        print(f"🔃 Intento {intento + 1} | {status}")
+        logger.debug(
+            "Download status",
+            extra={"video_uid": video_uid, "attempt": intento + 1, "status": status},
+        )
 
         if status == "ready" and url:
             try:
-                print("⏳ Descargando video...")
-                await download_video(url, ruta_destino)
-                print("✅ Descarga completada.")
-                return True, url  # ✅
-            except Exception as e:
-                print(f"❌ Error durante la descarga: {e}")
+                start = time.perf_counter()
+                size = await download_video(url, ruta_destino)
+                elapsed = time.perf_counter() - start
+
+                if elapsed > 0:
+                    PIPELINE_DOWNLOAD_THROUGHPUT.observe(size / elapsed)
+                logger.info(
+                    "Video downloaded",
+                    extra={
+                        "video_uid": video_uid,
+                        "bytes": size,
+                        "bytes_per_second": round(size / elapsed) if elapsed else None,
+                    },
+                )
+                return True, url
+            except Exception:
+                logger.exception(
+                    "Video download failed", extra={"video_uid": video_uid}
+                )
                 return False, None
 
         # Backoff exponencial con jitter
         wait_time = base_wait * (2**intento) + random.uniform(0, 1)
-        print(f"🔃 Reintentado en {wait_time:.2f} segundos...")
         await asyncio.sleep(wait_time)
 
-    print("❌ Error limite de reintentos alcanzado.")
+    logger.error(
+        "Download retries exhausted",
+        extra={"video_uid": video_uid, "attempts": max_retries},
+    )
     return False, None
 
 
@@ -73,60 +175,80 @@ async def handle_stream_to_audio(
     tmp_dir = tempfile.gettempdir()  # ✅ Asegura que /tmp exista
 
     video_path = f"{tmp_dir}/{id_archivo}.mp4"
-    audio_path = f"{tmp_dir}/{id_archivo}.mp3"
     r2_key = f"audios/{id_archivo}.mp3"
 
+    tags = {"evaluation_id": evaluation_id, "video_uid": video_uid}
+
+    _running_analyses[id_archivo] = time.monotonic()
+    PIPELINE_IN_FLIGHT.set(len(_running_analyses))
+
     try:
-        is_ready = await wait_until_ready_to_stream(video_uid)
+        with pipeline_stage("ready_wait", **tags) as stage:
+            is_ready = await wait_until_ready_to_stream(video_uid)
+            if not is_ready:
+                stage["status"] = "timeout"
 
         if not is_ready:
-            print("❌ El video no está listo. Abortando proceso.")
             return None
 
-        print("📥 Habilitando descarga del video en Cloudflare...")
-        await enable_download(video_uid)
-
-        print("⏳ Esperando a que el enlace de descarga esté listo...")
-        success, download_url = await wait_and_download_video(video_uid, video_path)
+        with pipeline_stage("download", **tags) as stage:
+            await enable_download(video_uid)
+            success, download_url = await wait_and_download_video(video_uid, video_path)
+            if not success:
+                stage["status"] = "failed"
 
         if not success:
-            print("Fallo en la descarga del video.")
             return None
 
-        print("🎧 Extrayendo audio...")
-        await run_in_threadpool(extract_audio, video_path, audio_path)
+        audio = bytearray()
 
-        print("📤 Subiendo audio a R2...")
-        await run_in_threadpool(
-            r2_upload, archivo_local=audio_path, nombre_objetivo=r2_key
-        )
+        async def audio_chunks():
+            with pipeline_stage("extraction", **tags) as stage:
+                async for chunk in extract_audio(video_path):
+                    audio.extend(chunk)
+                    yield chunk
+                stage["bytes"] = len(audio)
 
-        print("🧠 Enviando audio...")
-        audio_result = await run_in_threadpool(audio_analysis, audio_path)
+        # La subida a R2 avanza mientras ffmpeg sigue extrayendo
+        with pipeline_stage("r2_upload", **tags) as stage:
+            stage["bytes"] = await r2_upload_stream(
+                audio_chunks(), r2_key, content_type="audio/mpeg"
+            )
 
-        print(f"📝 Transcripción completada:\n{audio_result}...")
+        with pipeline_stage("transcription", **tags) as stage:
+            transcription = await run_in_threadpool(transcribe_audio, bytes(audio))
+            stage["characters"] = len(transcription)
 
-        print("💾 Guardando análisis de evaluación...")
+        with pipeline_stage("llm_analysis", **tags):
+            audio_result = await run_in_threadpool(analyze_transcription, transcription)
 
-        executive_view, operative_view = split_analysis(audio_result)
+        with pipeline_stage("db_write", **tags):
+            executive_view, operative_view = split_analysis(audio_result)
 
-        evaluation_analysis = EvaluationAnalysisBase(
-            evaluation_id=evaluation_id,
-            analysis=audio_result,
-            executive_view=executive_view,
-            operative_view=operative_view,
-        )
+            evaluation_analysis = EvaluationAnalysisBase(
+                evaluation_id=evaluation_id,
+                analysis=audio_result,
+                executive_view=executive_view,
+                operative_view=operative_view,
+                audio_key=r2_key,
+            )
 
-        await create_evaluation_analysis(session, evaluation_analysis)
+            await create_evaluation_analysis(session, evaluation_analysis)
 
         return "✅ Transcripción completada y guardada."
 
-    except Exception as e:
-        print(f"❌ Error durante el proceso: {e}")
+    except asyncio.CancelledError:
+        # El apagado superó SERVER_GRACEFUL_TIMEOUT: este análisis no se guardó
+        logger.error("Media pipeline cancelled", extra=tags)
+        raise
+
+    except Exception:
+        logger.exception("Media pipeline failed", extra=tags)
         return None
 
     finally:
-        for f in [video_path, audio_path]:
-            if os.path.exists(f):
-                os.remove(f)
-                print(f"🗑️ Archivo temporal eliminado: {f}")
+        _running_analyses.pop(id_archivo, None)
+        PIPELINE_IN_FLIGHT.set(len(_running_analyses))
+
+        if os.path.exists(video_path):
+            os.remove(video_path)
@@ -0,0 +1,143 @@
+import asyncio
+import time
+import httpx
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.db import engine, read_engine
+from app.core.http_client import get_http_client
+from app.services.extract_audio_services import analysis_queue
+
+ENGINES = {"primary": engine}
+if read_engine is not engine:
+    ENGINES["replica"] = read_engine
+
+# Cualquier respuesta HTTP (aunque sea 401/404) cuenta como alcanzable
+DEPENDENCIES = {
+    "cloudflare": "https://api.cloudflare.com/client/v4/",
+    "r2": settings.R2_ENDPOINT_URL,
+    "openai": "https://api.openai.com/v1/",
+}
+
+# Nombre del engine -> última sentencia que terminó bien (monotonic)
+_last_statement: dict[str, float] = {}
+
+# (vence, resultado) de cada chequeo cacheado
+_readiness: tuple[float, dict] | None = None
+_dependencies: tuple[float, dict] | None = None
+_readiness_lock = asyncio.Lock()
+_dependencies_lock = asyncio.Lock()
+
+
+def _track_statements(name: str, target: AsyncEngine) -> None:
+    @event.listens_for(target.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _last_statement[name] = time.monotonic()
+
+
+for _name, _target in ENGINES.items():
+    _track_statements(_name, _target)
+
+
+async def _check_engine(name: str, target: AsyncEngine) -> dict:
+    pool = target.pool
+    capacity = pool.size() + settings.DB_MAX_OVERFLOW
+    stats = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # Todas ocupadas: se informa, pero en un pico normal no saca al worker
+        # de rotación
+        "exhausted": pool.checkedout() >= capacity,
+    }
+
+    # Si el tráfico ya ejecutó sentencias hace poco, la base responde: no se
+    # toma ninguna conexión (con el pool agotado la prueba haría cola)
+    recent = time.monotonic() - _last_statement.get(name, float("-inf"))
+    if recent < settings.HEALTH_CACHE_TTL:
+        return {"ok": True, **stats}
+
+    # Sin sentencias recientes se prueba; si el pool está agotado y nadie lo
+    # libera, la espera vence en HEALTH_DB_TIMEOUT
+    try:
+        async with asyncio.timeout(settings.HEALTH_DB_TIMEOUT):
+            async with target.connect() as connection:
+                await connection.exec_driver_sql("SELECT 1")
+    except (OSError, SQLAlchemyError, TimeoutError) as error:
+        return {"ok": False, "error": type(error).__name__, **stats}
+
+    return {"ok": True, **stats}
+
+
+async def _check_dependency(url: str) -> dict:
+    start = time.perf_counter()
+    try:
+        await get_http_client().head(url, timeout=settings.HEALTH_DB_TIMEOUT)
+    except httpx.HTTPError as error:
+        return {"ok": False, "error": type(error).__name__}
+
+    return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000)}
+
+
+async def get_dependencies() -> dict:
+    global _dependencies
+
+    async with _dependencies_lock:
+        if _dependencies is None or _dependencies[0] <= time.monotonic():
+            results = await asyncio.gather(
+                *(_check_dependency(url) for url in DEPENDENCIES.values())
+            )
+            _dependencies = (
+                time.monotonic() + settings.HEALTH_DEPENDENCIES_TTL,
+                dict(zip(DEPENDENCIES, results)),
+            )
+
+    return _dependencies[1]
+
+
+async def _build_readiness() -> dict:
+    databases = dict(
+        zip(
+            ENGINES,
+            await asyncio.gather(
+                *(_check_engine(name, target) for name, target in ENGINES.items())
+            ),
+        )
+    )
+
+    running, oldest = analysis_queue()
+    analyses = {
+        "running": running,
+        "oldest_seconds": round(oldest, 1),
+        "max": settings.HEALTH_MAX_ANALYSES,
+        "ok": settings.HEALTH_MAX_ANALYSES is None
+        or running < settings.HEALTH_MAX_ANALYSES,
+    }
+
+    ready = analyses["ok"] and all(check["ok"] for check in databases.values())
+    result = {
+        "status": "ok" if ready else "unavailable",
+        "databases": databases,
+        "analyses": analyses,
+    }
+
+    # Una caída de un proveedor externo no debe sacar de rotación a todos los
+    # workers: se informa pero no cambia el estado
+    if settings.HEALTH_CHECK_DEPENDENCIES:
+        result["dependencies"] = await get_dependencies()
+
+    return result
+
+
+async def get_readiness() -> dict:
+    global _readiness
+
+    # Una sola comprobación por TTL aunque lleguen varias sondas a la vez
+    async with _readiness_lock:
+        if _readiness is None or _readiness[0] <= time.monotonic():
+            result = await _build_readiness()
+            _readiness = (time.monotonic() + settings.HEALTH_CACHE_TTL, result)
+
+    return _readiness[1]
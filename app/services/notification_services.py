@@ -2,17 +2,19 @@ from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import func, select
-from sqlalchemy.orm import selectinload
 
+from app.models.campaign_model import Campaign
 from app.models.evaluation_model import Evaluation, StatusEnum
 from app.models.notification_model import (
     Notification,
     NotificationBase,
+    NotificationListItem,
     NotificationPublic,
 )
 from app.models.user_model import User
 from app.models.user_zone_model import UserZone
 from app.utils.exeptions import NotFoundException
+from app.utils.helpers.nest_columns import SEPARATOR, labeled, nest_columns
 
 
 async def get_notifications(
@@ -20,21 +22,45 @@ async def get_notifications(
     company_id: Optional[int] = None,
     role: Optional[int] = None,
     user_id: Optional[int] = None,
-) -> List[NotificationPublic]:
+) -> List[NotificationListItem]:
 
     query = (
-        select(Notification)
-        .options(
-            selectinload(Notification.evaluation).selectinload(Evaluation.campaign),
-            selectinload(Notification.user),
+        select(
+            Notification.id,
+            Notification.user_id,
+            Notification.evaluation_id,
+            Notification.status,
+            Notification.read,
+            Notification.comment,
+            Notification.created_at,
+            Notification.updated_at,
+            Notification.deleted_at,
+            *labeled(
+                "user", User.id, User.first_name, User.last_name, User.email, User.role
+            ),
+            *labeled(
+                "evaluation",
+                Evaluation.id,
+                Evaluation.status,
+                Evaluation.evaluated_collaborator,
+            ),
+            *labeled(
+                f"evaluation{SEPARATOR}campaign",
+                Campaign.id,
+                Campaign.name,
+                Campaign.channel,
+                Campaign.date_start,
+                Campaign.date_end,
+            ),
         )
+        .join(User, Notification.user_id == User.id, isouter=True)
+        .join(Evaluation, Notification.evaluation_id == Evaluation.id, isouter=True)
+        .join(Campaign, Evaluation.campaigns_id == Campaign.id, isouter=True)
         .where(Notification.deleted_at == None)
     )
 
     if company_id is not None:
-        query = query.join(User, Notification.user_id == User.id, isouter=True).where(
-            User.company_id == company_id
-        )
+        query = query.where(User.company_id == company_id)
 
     if role is not None and role in [2]:
         user_zone_ids_subq = (
@@ -68,9 +94,11 @@ async def get_notifications(
     query = query.order_by(Notification.id)
 
     result = await session.execute(query)
-    db_notifications = result.scalars().all()
 
-    return [NotificationPublic.model_validate(n) for n in db_notifications]
+    return [
+        NotificationListItem.model_validate(nest_columns(row))
+        for row in result.mappings()
+    ]
 
 
 async def get_notification_count(
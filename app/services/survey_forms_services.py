@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Mapping, Optional
 from fastapi import Query
-from sqlmodel import delete, func, select
+from sqlmodel import func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -11,14 +11,22 @@ from app.models.survey_forms_model import (
     SurveyFormPublic,
     SurveyFormsCreate,
     SurveyFormsPublic,
+    SurveyFormsUpdate,
 )
 from app.models.survey_model import (
     SurveySection,
+    SurveySectionCreate,
     SurveyAspect,
 )
 from app.types.pagination import Pagination
 from app.utils.exeptions import NotFoundException
 
+SECTION_FIELDS = {"name", "maximum_score", "order"}
+ASPECT_FIELDS = {"description", "type", "maximum_score", "order"}
+
+# Snapshots inmutables del árbol de cada formulario (form_id -> versión vigente)
+_form_snapshots: dict[int, SurveyFormPublic] = {}
+
 
 async def get_forms_by_company(
     session: AsyncSession,
@@ -59,27 +67,115 @@ async def get_forms_by_company(
     return SurveyFormsPublic(data=forms, pagination=pagination)
 
 
-async def get_form_by_id(
-    session: AsyncSession, form_id: int, company_id: int
-) -> SurveyFormPublic:
+def get_form_etag(form_id: int, version: int) -> str:
+    return f'W/"survey-form-{form_id}-v{version}"'
+
+
+async def load_form_snapshot(session: AsyncSession, form_id: int) -> SurveyFormPublic:
 
     query = (
         select(SurveyForm)
-        .options(selectinload(SurveyForm.sections).selectinload(SurveySection.aspects))
-        .where(
-            SurveyForm.id == form_id,
-            SurveyForm.company_id == company_id,
-            SurveyForm.deleted_at == None,
+        .options(
+            selectinload(
+                SurveyForm.sections.and_(SurveySection.deleted_at == None)
+            ).selectinload(SurveySection.aspects.and_(SurveyAspect.deleted_at == None))
         )
+        .where(SurveyForm.id == form_id)
+        .execution_options(populate_existing=True)
     )
 
     result = await session.execute(query)
-    db_forms = result.unique().scalar_one_or_none()
+    db_form = result.unique().scalar_one_or_none()
 
-    if not db_forms:
+    if not db_form:
         raise NotFoundException("Survey form not found")
 
-    return db_forms
+    snapshot = SurveyFormPublic.model_validate(db_form)
+
+    snapshot.sections.sort(key=lambda section: section.order)
+    for section in snapshot.sections:
+        section.aspects.sort(key=lambda aspect: aspect.order)
+
+    _form_snapshots[form_id] = snapshot
+
+    return snapshot
+
+
+# El árbol del formulario se toma del snapshot de su versión vigente
+async def get_form_snapshot(
+    session: AsyncSession, form: SurveyForm
+) -> SurveyFormPublic:
+    snapshot = _form_snapshots.get(form.id)
+
+    if snapshot is not None and snapshot.version == form.version:
+        return snapshot
+
+    return await load_form_snapshot(session, form.id)
+
+
+async def get_form(
+    session: AsyncSession, form_id: int, company_id: Optional[int] = None
+) -> SurveyForm:
+
+    query = select(SurveyForm).where(
+        SurveyForm.id == form_id,
+        SurveyForm.deleted_at == None,
+    )
+
+    if company_id is not None:
+        query = query.where(SurveyForm.company_id == company_id)
+
+    result = await session.execute(query)
+    db_form = result.scalar_one_or_none()
+
+    if not db_form:
+        raise NotFoundException("Survey form not found")
+
+    return db_form
+
+
+async def get_form_by_id(
+    session: AsyncSession, form_id: int, company_id: Optional[int] = None
+) -> SurveyFormPublic:
+
+    db_form = await get_form(session, form_id, company_id)
+
+    return await get_form_snapshot(session, db_form)
+
+
+async def export_survey_form(
+    session: AsyncSession, form_id: int, company_id: Optional[int] = None
+) -> SurveyFormsCreate:
+    snapshot = await get_form_by_id(session, form_id, company_id)
+
+    # Mismo formato que la creación, sin ids ni empresa, para clonar entre empresas
+    return SurveyFormsCreate.model_validate(snapshot.model_dump())
+
+
+async def insert_sections(
+    session: AsyncSession, form_id: int, sections: List[SurveySectionCreate]
+) -> None:
+    if not sections:
+        return
+
+    # Un INSERT para todas las secciones y otro para todos sus aspectos
+    result = await session.execute(
+        insert(SurveySection).returning(SurveySection.id, sort_by_parameter_order=True),
+        [
+            {**section.model_dump(include=SECTION_FIELDS), "form_id": form_id}
+            for section in sections
+        ],
+    )
+    section_ids = result.scalars().all()
+
+    aspects = [
+        {**aspect.model_dump(include=ASPECT_FIELDS), "section_id": section_id}
+        for section_id, section in zip(section_ids, sections)
+        for aspect in section.aspects
+    ]
+
+    if aspects:
+        await session.execute(insert(SurveyAspect), aspects)
 
 
 async def create_survey_form(
@@ -90,91 +186,145 @@ async def create_survey_form(
     session.add(form)
     await session.flush()  # para obtener form.id
 
-    for section in data.sections:
-        db_section = SurveySection(
-            name=section.name,
-            maximum_score=section.maximum_score,
-            order=section.order,
-            form_id=form.id,
-        )
-        session.add(db_section)
-        await session.flush()
-
-        for aspect in section.aspects:
-            db_aspect = SurveyAspect(
-                description=aspect.description,
-                maximum_score=aspect.maximum_score,
-                order=aspect.order,
-                section_id=db_section.id,
-            )
-            session.add(db_aspect)
+    await insert_sections(session, form.id, data.sections)
 
     await session.commit()
-    await session.refresh(form)
+    await load_form_snapshot(session, form.id)
 
     return form
 
 
+def has_changes(current: Mapping[str, Any], data: dict) -> bool:
+    return any(current[key] != value for key, value in data.items())
+
+
 async def update_survey_form(
     session: AsyncSession,
     form_id: int,
     company_id: int,
-    data: SurveyFormsCreate,
+    data: SurveyFormsUpdate,
 ) -> SurveyForm:
-    # Verificar existencia
+    form = await get_form(session, form_id, company_id)
+
+    # Estado actual del árbol (solo filas activas)
     result = await session.execute(
-        select(SurveyForm).where(
-            SurveyForm.id == form_id,
-            SurveyForm.company_id == company_id,
-            SurveyForm.deleted_at == None,
-        )
+        select(
+            SurveySection.id, *(getattr(SurveySection, f) for f in SECTION_FIELDS)
+        ).where(SurveySection.form_id == form_id, SurveySection.deleted_at == None)
     )
-    form = result.scalar_one_or_none()
-    if not form:
-        raise NotFoundException("Form not found")
-
-    # Actualizar título
-    form.title = data.title
-
-    # Eliminar secciones y aspectos anteriores
-    await session.execute(
-        delete(SurveyAspect).where(
-            SurveyAspect.section_id.in_(
-                select(SurveySection.id).where(SurveySection.form_id == form_id)
-            )
+    db_sections = {row["id"]: row for row in result.mappings().all()}
+
+    result = await session.execute(
+        select(
+            SurveyAspect.id,
+            SurveyAspect.section_id,
+            *(getattr(SurveyAspect, f) for f in ASPECT_FIELDS),
+        ).where(
+            SurveyAspect.section_id.in_(db_sections.keys()),
+            SurveyAspect.deleted_at == None,
         )
     )
-    await session.execute(delete(SurveySection).where(SurveySection.form_id == form_id))
+    db_aspects = {row["id"]: row for row in result.mappings().all()}
+
+    # Comparar por id: las filas conservan su id y solo se tocan las modificadas
+    new_sections = []
+    section_updates = []
+    aspect_inserts = []
+    aspect_updates = []
+    kept_section_ids = set()
+    kept_aspect_ids = set()
 
-    # Agregar nuevas secciones y aspectos
     for section in data.sections:
-        db_section = SurveySection(
-            name=section.name,
-            maximum_score=section.maximum_score,
-            order=section.order,
-            form_id=form.id,
-        )
-        session.add(db_section)
-        await session.flush()
+        if section.id is None:
+            new_sections.append(section)
+            continue
+
+        if section.id not in db_sections:
+            raise NotFoundException("Survey section not found")
+
+        kept_section_ids.add(section.id)
+        section_data = section.model_dump(include=SECTION_FIELDS)
+
+        if has_changes(db_sections[section.id], section_data):
+            section_updates.append({"id": section.id, **section_data})
 
         for aspect in section.aspects:
-            db_aspect = SurveyAspect(
-                description=aspect.description,
-                maximum_score=aspect.maximum_score,
-                order=aspect.order,
-                section_id=db_section.id,
-            )
-            session.add(db_aspect)
+            aspect_data = {
+                **aspect.model_dump(include=ASPECT_FIELDS),
+                "section_id": section.id,
+            }
+
+            if aspect.id is None:
+                aspect_inserts.append(aspect_data)
+                continue
+
+            if aspect.id not in db_aspects:
+                raise NotFoundException("Survey aspect not found")
+
+            kept_aspect_ids.add(aspect.id)
+
+            if has_changes(db_aspects[aspect.id], aspect_data):
+                aspect_updates.append({"id": aspect.id, **aspect_data})
+
+    removed_section_ids = db_sections.keys() - kept_section_ids
+    removed_aspect_ids = db_aspects.keys() - kept_aspect_ids
+
+    # Las filas retiradas se eliminan lógicamente para no romper
+    # las respuestas históricas que apuntan a ellas
+    now = datetime.now()
+
+    if removed_aspect_ids:
+        await session.execute(
+            update(SurveyAspect)
+            .where(SurveyAspect.id.in_(removed_aspect_ids))
+            .values(deleted_at=now)
+        )
+
+    if removed_section_ids:
+        await session.execute(
+            update(SurveySection)
+            .where(SurveySection.id.in_(removed_section_ids))
+            .values(deleted_at=now)
+        )
+
+    if section_updates:
+        await session.execute(update(SurveySection), section_updates)
+
+    if aspect_updates:
+        await session.execute(update(SurveyAspect), aspect_updates)
+
+    if aspect_inserts:
+        await session.execute(insert(SurveyAspect), aspect_inserts)
+
+    await insert_sections(session, form.id, new_sections)
+
+    tree_changed = any(
+        [
+            new_sections,
+            section_updates,
+            aspect_inserts,
+            aspect_updates,
+            removed_section_ids,
+            removed_aspect_ids,
+        ]
+    )
+
+    # Publicar una nueva versión solo si el formulario cambió
+    if tree_changed or form.title != data.title:
+        form.title = data.title
+        form.version = form.version + 1
 
     await session.commit()
     await session.refresh(form)
+    await load_form_snapshot(session, form.id)
+
     return form
 
 
 async def soft_delete_form(
     session: AsyncSession, form_id: int, company_id: int
 ) -> SurveyForm:
-    db_form = await get_form_by_id(session, form_id, company_id)
+    db_form = await get_form(session, form_id, company_id)
     db_form.deleted_at = datetime.now()
 
     await session.commit()
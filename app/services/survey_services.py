@@ -3,14 +3,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from sqlalchemy.orm import selectinload
 
-from app.models.survey_model import SurveySection
+from app.models.survey_model import SurveyAspect, SurveySection
 from app.utils.exeptions import NotFoundException
 
 
 async def get_survey(session: AsyncSession) -> List[SurveySection]:
     query = (
         select(SurveySection)
-        .options(selectinload(SurveySection.aspects))
+        .options(
+            selectinload(SurveySection.aspects.and_(SurveyAspect.deleted_at == None))
+        )
+        .where(SurveySection.deleted_at == None)
         .order_by(SurveySection.order)
     )
     result = await session.execute(query)
@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Optional
 from fastapi import Query
+from sqlalchemy import literal, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import func, select, update
 from sqlalchemy.orm import selectinload
@@ -12,9 +14,17 @@ from app.models.user_zone_model import (
     UserZonePublic,
     UserZonesPublic,
 )
-from app.models.zone_model import Zone
+from app.services.zone_services import ensure_zones, get_cached_zone, search_zone_ids
 from app.types.pagination import Pagination
 from app.utils.exeptions import NotFoundException
+from app.utils.helpers.unnest_ids import unnest_ids
+
+
+# La zona sale de la caché en memoria en lugar de un JOIN con zones
+def _user_zone_public(db_user_zone: UserZone) -> UserZonePublic:
+    return UserZonePublic.model_validate(
+        db_user_zone, update={"zone": get_cached_zone(db_user_zone.zone_id)}
+    )
 
 
 async def get_users_zones(
@@ -26,11 +36,12 @@ async def get_users_zones(
     company_id: int | None = None,
 ) -> UserZonesPublic:
 
+    await ensure_zones(session)
+
     query = (
         select(UserZone, func.count().over().label("total"))
-        .join(Zone, UserZone.zone_id == Zone.id, isouter=True)
         .join(User, User.id == UserZone.user_id)
-        .options(selectinload(UserZone.zone), selectinload(UserZone.user))
+        .options(selectinload(UserZone.user))
         .where(UserZone.deleted_at == None)
     )
 
@@ -40,7 +51,7 @@ async def get_users_zones(
     if filter and search:
         match filter:
             case "zone":
-                query = query.where(Zone.name.ilike(f"%{search}%"))
+                query = query.where(UserZone.zone_id.in_(search_zone_ids(search)))
 
     query = query.order_by(UserZone.id).offset(offset).limit(limit)
 
@@ -50,18 +61,18 @@ async def get_users_zones(
     if not db_user_zones:
         raise NotFoundException("User zones not found")
 
-    user_zones = [row[0] for row in db_user_zones]
+    user_zones = [_user_zone_public(row[0]) for row in db_user_zones]
     total = db_user_zones[0][1] if db_user_zones else 0
     pagination = Pagination(first=offset, rows=limit, total=total)
 
     return UserZonesPublic(data=user_zones, pagination=pagination)
 
 
-async def get_user_zone(session: AsyncSession, user_zone_id: int) -> UserZonePublic:
+async def _get_user_zone_entity(session: AsyncSession, user_zone_id: int) -> UserZone:
     query = (
         select(UserZone)
         .where(UserZone.id == user_zone_id, UserZone.deleted_at == None)
-        .options(selectinload(UserZone.zone), selectinload(UserZone.user))
+        .options(selectinload(UserZone.user))
     )
 
     result = await session.execute(query)
@@ -73,25 +84,51 @@ async def get_user_zone(session: AsyncSession, user_zone_id: int) -> UserZonePub
     return db_user_zone
 
 
+async def get_user_zone(session: AsyncSession, user_zone_id: int) -> UserZonePublic:
+    await ensure_zones(session)
+    db_user_zone = await _get_user_zone_entity(session, user_zone_id)
+
+    return _user_zone_public(db_user_zone)
+
+
 async def create_zone_users(
     session: AsyncSession,
     data: AssignZonesRequest,
 ):
 
-    await session.execute(
+    # Se dan de baja solo las zonas que ya no vienen en la lista
+    removed = await session.execute(
         update(UserZone)
         .where(UserZone.user_id == data.user_id)
         .where(UserZone.deleted_at.is_(None))
+        .where(UserZone.zone_id.not_in(data.zone_ids))
         .values(deleted_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+
+    # Las zonas que ya estaban activas se conservan (índice parcial único)
+    created = await session.execute(
+        insert(UserZone)
+        .from_select(
+            ["user_id", "zone_id"],
+            select(literal(data.user_id), unnest_ids(data.zone_ids)),
+        )
+        .on_conflict_do_nothing(
+            index_elements=["user_id", "zone_id"],
+            index_where=text("deleted_at IS NULL"),
+        )
+        .returning(UserZone.id)
     )
 
-    for zone_id in data.zone_ids:
-        user_zone = UserZone(user_id=data.user_id, zone_id=zone_id)
-        session.add(user_zone)
+    response = {
+        "message": "User zones created",
+        "created": len(created.all()),
+        "removed": removed.rowcount,
+    }
 
     await session.commit()
 
-    return {"message": "User zones created"}
+    return response
 
 
 async def update_user_zone(
@@ -99,20 +136,22 @@ async def update_user_zone(
     user_zone_id: int,
     new_zone_id: int,
 ) -> UserZonePublic:
-    db_user_zone = await get_user_zone(session, user_zone_id)
+    await ensure_zones(session)
+    db_user_zone = await _get_user_zone_entity(session, user_zone_id)
 
     db_user_zone.zone_id = new_zone_id
 
     await session.commit()
     await session.refresh(db_user_zone)
 
-    return db_user_zone
+    return _user_zone_public(db_user_zone)
 
 
 async def soft_delete_user_zone(
     session: AsyncSession, user_zone_id: int
 ) -> UserZonePublic:
-    db_user_zone = await get_user_zone(session, user_zone_id)
+    await ensure_zones(session)
+    db_user_zone = await _get_user_zone_entity(session, user_zone_id)
 
     db_user_zone.deleted_at = datetime.now()
 
@@ -120,4 +159,4 @@ async def soft_delete_user_zone(
     await session.commit()
     await session.refresh(db_user_zone)
 
-    return db_user_zone
+    return _user_zone_public(db_user_zone)
@@ -1,23 +1,81 @@
-from typing import Optional
-from fastapi import Query
+import csv
+import io
+import json
+from typing import AsyncIterator, BinaryIO, Iterator, Optional
+from fastapi import HTTPException, Query
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import and_, func, or_, select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
-from app.core.security import get_password_hash
+from app.core.db import AsyncSessionLocal
+from app.core.security import get_password_hash, hash_passwords
 from app.models.company_model import Company
 from app.models.user_model import (
     User,
     UserCreate,
+    UserImportError,
+    UserImportProgress,
+    UserImportRow,
+    UserListItem,
     UserPublic,
     UserUpdate,
     UserUpdateMe,
     UsersPublic,
 )
 from app.models.user_zone_model import UserZone
+from app.services.zone_services import ensure_zones, get_active_zone_ids
 from app.types.pagination import Pagination
 from app.utils.exeptions import InvalidCredentialsException, NotFoundException
+from app.utils.helpers.nest_columns import labeled, nest_columns
+from app.utils.helpers.role_checker import check_role_creation_permissions
+
+
+async def _user_list(
+    session: AsyncSession, query, offset: int, limit: int
+) -> UsersPublic:
+    # query filtra y cuenta ids; las columnas y la empresa se leen solo para la
+    # página
+    page = query.order_by(User.id).offset(offset).limit(limit).subquery()
+
+    query = (
+        select(
+            User.id,
+            User.role,
+            User.first_name,
+            User.last_name,
+            User.gender,
+            User.birthdate,
+            User.civil_status,
+            User.socioeconomic,
+            User.inclusivity,
+            User.email,
+            User.company_id,
+            User.created_at,
+            User.updated_at,
+            User.deleted_at,
+            page.c.total,
+            *labeled("company", Company.id, Company.name),
+        )
+        .join(page, page.c.id == User.id)
+        .join(Company, User.company_id == Company.id, isouter=True)
+        .order_by(User.id)
+    )
+
+    result = await session.execute(query)
+    db_users = result.mappings().all()
+
+    if not db_users:
+        raise NotFoundException("Users not found")
+
+    users = [UserListItem.model_validate(nest_columns(row)) for row in db_users]
+    total = db_users[0]["total"]
+    pagination = Pagination(first=offset, rows=limit, total=total)
+
+    return UsersPublic(data=users, pagination=pagination)
 
 
 async def get_users(
@@ -30,10 +88,8 @@ async def get_users(
     user_id: Optional[int] = None,
 ) -> UsersPublic:
 
-    query = (
-        select(User, func.count().over().label("total"))
-        .options(selectinload(User.company))
-        .where(User.deleted_at == None)
+    query = select(User.id, func.count().over().label("total")).where(
+        User.deleted_at == None
     )
 
     if company_id is not None:
@@ -65,21 +121,11 @@ async def get_users(
                 query = query.where(User.email.ilike(f"%{search}%"))
 
             case "company":
-                query = query.where(Company.name.ilike(f"%{search}%"))
-
-    query = query.order_by(User.id).offset(offset).limit(limit)
+                query = query.join(Company, User.company_id == Company.id).where(
+                    Company.name.ilike(f"%{search}%")
+                )
 
-    result = await session.execute(query)
-    db_users = result.unique().all()
-
-    if not db_users:
-        raise NotFoundException("Users not found")
-
-    patients = [row[0] for row in db_users]
-    total = db_users[0][1] if db_users else 0
-    pagination = Pagination(first=offset, rows=limit, total=total)
-
-    return UsersPublic(data=patients, pagination=pagination)
+    return await _user_list(session, query, offset, limit)
 
 
 async def get_users_plain(
@@ -168,7 +214,7 @@ async def get_user_by_zone(
 
     # Construcción del query principal
     query = (
-        select(User, func.count().over().label("total"))
+        select(User.id, func.count().over().label("total"))
         .join(Company, User.company_id == Company.id, isouter=True)
         .where(
             User.deleted_at == None,
@@ -176,7 +222,6 @@ async def get_user_by_zone(
             User.company_id == company_id,
             User.id != user_id,  # 👈 EXCLUYE al usuario autenticado
         )
-        .options(selectinload(User.company))
     )
 
     # Filtros
@@ -205,20 +250,7 @@ async def get_user_by_zone(
             case "company":
                 query = query.where(Company.name.ilike(f"%{search}%"))
 
-    # Paginación
-    query = query.order_by(User.id).offset(offset).limit(limit)
-
-    result = await session.execute(query)
-    db_users = result.unique().all()
-
-    if not db_users:
-        raise NotFoundException("Users not found")
-
-    users = [row[0] for row in db_users]
-    total = db_users[0][1] if db_users else 0
-    pagination = Pagination(first=offset, rows=limit, total=total)
-
-    return UsersPublic(data=users, pagination=pagination)
+    return await _user_list(session, query, offset, limit)
 
 
 async def get_user_by_email(
@@ -305,3 +337,219 @@ async def soft_delete_user(session: AsyncSession, user_id: int) -> UserPublic:
     await session.refresh(db_user)
 
     return UserPublic.model_validate(db_user)
+
+
+USER_IMPORT_FORMATS = ("csv", "json", "jsonl")
+USER_IMPORT_BATCH_SIZE = 500
+
+
+def read_user_import_rows(file: BinaryIO, file_format: str) -> Iterator[dict | str]:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+    match file_format:
+        case "csv":
+            for row in csv.DictReader(text):
+                # Las celdas vacías se omiten para que apliquen los valores por defecto
+                yield {
+                    key.strip(): value.strip()
+                    for key, value in row.items()
+                    if key and value and value.strip()
+                }
+
+        case "jsonl":
+            for line in text:
+                if line.strip():
+                    yield line
+
+        case "json":
+            # Un arreglo JSON no se puede leer por partes; se recomienda jsonl
+            rows = json.load(text)
+            yield from rows if isinstance(rows, list) else [rows]
+
+
+def _validate_import_row(
+    raw: dict | str,
+    creator_role: int,
+    company_id: Optional[int],
+) -> UserImportRow:
+    row = (
+        UserImportRow.model_validate_json(raw)
+        if isinstance(raw, str)
+        else UserImportRow.model_validate(raw)
+    )
+
+    check_role_creation_permissions(creator_role, row.role)
+
+    if company_id is not None:
+        row.company_id = company_id
+
+    if row.birthdate:
+        row.birthdate = row.birthdate.replace(tzinfo=None)
+
+    return row
+
+
+def _import_error_detail(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"]
+            for e in error.errors()
+        )
+    if isinstance(error, HTTPException):
+        return error.detail
+    return str(error)
+
+
+async def _insert_user_batch(
+    session: AsyncSession,
+    batch: list[tuple[int, UserImportRow]],
+    progress: UserImportProgress,
+) -> None:
+    errors = []
+
+    zone_ids = {zone_id for _, row in batch for zone_id in row.zone_ids}
+    valid_zones = set()
+
+    if zone_ids:
+        await ensure_zones(session)
+        valid_zones = get_active_zone_ids(zone_ids)
+
+    rows = []
+    for number, row in batch:
+        missing = set(row.zone_ids) - valid_zones
+        if missing:
+            errors.append(
+                UserImportError(
+                    row=number,
+                    email=row.email,
+                    detail=f"Zones not found: {sorted(missing)}",
+                )
+            )
+        else:
+            rows.append((number, row))
+
+    created = {}
+    if rows:
+        hashes = await hash_passwords([row.password for _, row in rows])
+
+        # Un solo INSERT multi-fila; los correos existentes se reportan como conflicto
+        result = await session.execute(
+            insert(User)
+            .values(
+                [
+                    {
+                        **row.model_dump(exclude={"password", "zone_ids"}),
+                        "hashed_password": hashed,
+                    }
+                    for (_, row), hashed in zip(rows, hashes)
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User.id, User.email)
+        )
+        created = {email: user_id for user_id, email in result.all()}
+
+    conflicts = [
+        UserImportError(row=number, email=row.email, detail="Email already registered")
+        for number, row in rows
+        if row.email not in created
+    ]
+
+    user_zones = [
+        {"user_id": created[row.email], "zone_id": zone_id}
+        for _, row in rows
+        if row.email in created
+        for zone_id in set(row.zone_ids)
+    ]
+
+    if user_zones:
+        await session.execute(insert(UserZone).values(user_zones))
+
+    await session.commit()
+
+    progress.created += len(created)
+    progress.conflicts += len(conflicts)
+    progress.failed += len(errors)
+    progress.errors.extend(errors + conflicts)
+
+
+async def _import_user_batch(
+    session: AsyncSession,
+    batch: list[tuple[int, UserImportRow]],
+    progress: UserImportProgress,
+) -> None:
+    try:
+        await _insert_user_batch(session, batch, progress)
+    except SQLAlchemyError as error:
+        # Se descarta solo el lote; el resto del archivo sigue importándose
+        await session.rollback()
+        detail = str(getattr(error, "orig", error))
+        progress.failed += len(batch)
+        progress.errors.extend(
+            UserImportError(row=number, email=row.email, detail=detail)
+            for number, row in batch
+        )
+
+
+async def import_users(
+    file: BinaryIO,
+    file_format: str,
+    creator_role: int,
+    company_id: Optional[int] = None,
+) -> AsyncIterator[str]:
+    progress = UserImportProgress()
+    batch: list[tuple[int, UserImportRow]] = []
+    seen_emails = set()
+
+    # Sesión propia: la respuesta se envía por partes después del request
+    async with AsyncSessionLocal() as session:
+        rows = enumerate(read_user_import_rows(file, file_format), start=1)
+
+        while True:
+            try:
+                number, raw = next(rows)
+            except StopIteration:
+                break
+            except (ValueError, csv.Error) as error:
+                # Archivo mal formado (JSON inválido, codificación, etc.)
+                progress.failed += 1
+                progress.errors.append(
+                    UserImportError(row=progress.processed + 1, detail=str(error))
+                )
+                break
+
+            progress.processed += 1
+
+            try:
+                row = _validate_import_row(raw, creator_role, company_id)
+            except (ValidationError, HTTPException) as error:
+                progress.failed += 1
+                progress.errors.append(
+                    UserImportError(row=number, detail=_import_error_detail(error))
+                )
+                continue
+
+            if row.email in seen_emails:
+                progress.failed += 1
+                progress.errors.append(
+                    UserImportError(
+                        row=number, email=row.email, detail="Email duplicated in file"
+                    )
+                )
+                continue
+
+            seen_emails.add(row.email)
+            batch.append((number, row))
+
+            if len(batch) == USER_IMPORT_BATCH_SIZE:
+                await _import_user_batch(session, batch, progress)
+                batch.clear()
+
+                yield progress.model_dump_json() + "\n"
+                progress.errors = []
+
+        if batch:
+            await _import_user_batch(session, batch, progress)
+
+    progress.done = True
+    yield progress.model_dump_json() + "\n"
@@ -1,49 +1,129 @@
+import asyncio
+import logging
+import time
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from app.core.db import AsyncSessionLocal
 from app.models.user_zone_model import UserZone
 from app.models.zone_model import Zone, ZonePublic
 from app.utils.exeptions import NotFoundException
+from app.utils.helpers.etag import make_etag
 
+logger = logging.getLogger(__name__)
 
-async def get_zones(session: AsyncSession) -> List[ZonePublic]:
-    query = select(Zone).where(Zone.deleted_at == None).order_by(Zone.id)
+# Las zonas son datos de referencia (seeder): se leen una vez por proceso y se
+# sirven desde memoria. El TTL cubre cambios hechos por SQL o desde otro worker
+ZONES_CACHE_TTL = 3600
+ZONES_CACHE_CONTROL = f"private, max-age={ZONES_CACHE_TTL}"
+
+# Id -> zona, incluidas las dadas de baja (las asignaciones antiguas las muestran)
+_zones: dict[int, ZonePublic] = {}
+_active_zones: List[ZonePublic] = []
+_zones_version = 0
+_zones_expires_at = 0.0
+_zones_lock = asyncio.Lock()
+
+
+def invalidate_zones() -> None:
+    global _zones_version, _zones_expires_at
+
+    # Llamar tras cualquier escritura en zones; una carga que empezó antes de la
+    # escritura no queda como vigente
+    _zones_version += 1
+    _zones_expires_at = 0.0
+
+
+async def load_zones(session: AsyncSession) -> None:
+    global _zones, _active_zones, _zones_expires_at
+
+    version = _zones_version
+    result = await session.execute(select(Zone).order_by(Zone.id))
+    zones = [ZonePublic.model_validate(zone) for zone in result.scalars().all()]
+
+    _zones = {zone.id: zone for zone in zones}
+    _active_zones = [zone for zone in zones if zone.deleted_at is None]
+    if version == _zones_version:
+        _zones_expires_at = time.monotonic() + ZONES_CACHE_TTL
+
+
+async def warm_up_zones() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            await load_zones(session)
+    except Exception:
+        # Sin base de datos al arrancar se carga en la primera petición
+        logger.warning("Zones cache warm-up failed", exc_info=True)
+        return
+
+    logger.info("Zones cache loaded", extra={"zones": len(_zones)})
+
+
+async def ensure_zones(session: AsyncSession) -> None:
+    if _zones_expires_at > time.monotonic():
+        return
 
-    result = await session.execute(query)
-    db_zones = result.scalars().all()
+    # Una sola recarga aunque lleguen varias peticiones a la vez
+    async with _zones_lock:
+        if _zones_expires_at <= time.monotonic():
+            await load_zones(session)
 
-    if not db_zones:
+
+def get_cached_zone(zone_id: int | None) -> ZonePublic | None:
+    return _zones.get(zone_id)
+
+
+def get_active_zone_ids(zone_ids) -> set[int]:
+    return {
+        zone_id
+        for zone_id in zone_ids
+        if zone_id in _zones and _zones[zone_id].deleted_at is None
+    }
+
+
+# Equivale a Zone.name ILIKE '%search%' sin hacer JOIN con zones
+def search_zone_ids(search: str) -> List[int]:
+    search = search.lower()
+    return [zone.id for zone in _zones.values() if search in zone.name.lower()]
+
+
+async def get_zones(session: AsyncSession) -> List[ZonePublic]:
+    await ensure_zones(session)
+
+    if not _active_zones:
         raise NotFoundException("Zones not found")
 
-    return db_zones
+    return _active_zones
 
 
 async def get_limit_zones(session: AsyncSession, user_id: int) -> List[ZonePublic]:
-    query = (
-        select(Zone)
-        .join(UserZone, Zone.id == UserZone.zone_id)
-        .where(
-            UserZone.user_id == user_id,
-            Zone.deleted_at == None,
-            UserZone.deleted_at == None,
+    await ensure_zones(session)
+
+    # Solo las asignaciones van a la base de datos; las zonas salen de memoria
+    result = await session.execute(
+        select(UserZone.zone_id).where(
+            UserZone.user_id == user_id, UserZone.deleted_at == None
         )
-        .order_by(Zone.id)
     )
+    zone_ids = get_active_zone_ids(result.scalars().all())
 
-    result = await session.execute(query)
-    db_zones = result.scalars().all()
-
-    if not db_zones:
+    if not zone_ids:
         raise NotFoundException("No zones assigned to user")
 
-    return db_zones
+    return [_zones[zone_id] for zone_id in sorted(zone_ids)]
 
 
 async def get_zone(session: AsyncSession, zone_id: int) -> ZonePublic:
-    db_zone = await session.get(Zone, zone_id)
+    await ensure_zones(session)
+    db_zone = _zones.get(zone_id)
 
     if not db_zone:
         raise NotFoundException("Zone not found")
 
     return db_zone
+
+
+def get_zones_etag(zones: List[ZonePublic]) -> str:
+    # Cubre altas, bajas (deleted_at mueve updated_at) y cambios de asignación
+    return make_etag("zones", *(f"{zone.id}:{zone.updated_at}" for zone in zones))
@@ -1,16 +0,0 @@
-ALTER TABLE users ENABLE ROW LEVEL SECURITY;
-ALTER TABLE companies ENABLE ROW LEVEL SECURITY;
-ALTER TABLE payments ENABLE ROW LEVEL SECURITY;
-
-ALTER TABLE survey_forms ENABLE ROW LEVEL SECURITY;
-ALTER TABLE survey_sections ENABLE ROW LEVEL SECURITY;
-ALTER TABLE survey_aspects ENABLE ROW LEVEL SECURITY;
-
-ALTER TABLE campaigns ENABLE ROW LEVEL SECURITY;
-ALTER TABLE campaign_users ENABLE ROW LEVEL SECURITY;
-ALTER TABLE campaign_zones ENABLE ROW LEVEL SECURITY;
-
-ALTER TABLE evaluations ENABLE ROW LEVEL SECURITY;
-ALTER TABLE evaluation_answers ENABLE ROW LEVEL SECURITY;
-
-ALTER TABLE user_zones ENABLE ROW LEVEL SECURITY;
@@ -1,9 +1,9 @@
 from typing import Annotated, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from starlette.requests import Request
 
-from app.core.db import get_db
+from app.core.db import get_db, get_read_db, scope_session_to_company
 from app.core.security import decode_token, decode_token_no_verify
 from app.models.user_model import UserPublic
 from app.services.payment_services import is_company_payment_valid
@@ -15,6 +15,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 async def get_auth_user(
     request: Request,
+    response: Response,
     token: Annotated[str, Depends(oauth2_scheme)],
     session: AsyncSession = Depends(get_db),
 ) -> Optional[UserPublic]:
@@ -32,10 +33,29 @@ async def get_auth_user(
     payload = decode_token(token)
 
     request.state.user = user
+    # Para read-your-writes: un commit de esta sesión marca la respuesta
+    session.info["response"] = response
 
     return user
 
 
+async def get_tenant_db(
+    user=Depends(get_auth_user),
+    session: AsyncSession = Depends(get_read_db),
+) -> AsyncSession:
+    # Las políticas RLS filtran por empresa; el superadmin ve todas
+    if user.role != 0:
+        # Sin empresa no hay alcance: una sesión sin filtrar vería todas
+        if user.company_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="El usuario no pertenece a ninguna empresa",
+            )
+        await scope_session_to_company(session, user.company_id)
+
+    return session
+
+
 async def check_company_payment_status(
     user=Depends(get_auth_user),
     session: AsyncSession = Depends(get_db),
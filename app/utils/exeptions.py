@@ -58,3 +58,8 @@ class NotFoundException(HTTPException):
 class NoContentException(HTTPException):
     def __init__(self, detail: str):
         super().__init__(status_code=status.HTTP_204_NO_CONTENT, detail=detail)
+
+
+class BadRequestException(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
@@ -0,0 +1,22 @@
+import csv
+import io
+from typing import Any, Iterable
+
+
+# Misma interfaz que XlsxStreamWriter: cada llamada devuelve bytes listos
+class CsvStreamWriter:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        # BOM para que Excel abra el archivo como UTF-8
+        self._buffer.write("\ufeff")
+
+    def write_rows(self, rows: Iterable[Iterable[Any]]) -> bytes:
+        self._writer.writerows(rows)
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data.encode()
+
+    def close(self) -> bytes:
+        return b""
@@ -0,0 +1,41 @@
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response, status
+
+# El cliente guarda la respuesta pero revalida siempre con If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in parts).encode(), digest_size=16
+    ).hexdigest()
+    # Débil: el cuerpo con gzip y sin él comparten validador
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match usa comparación débil: W/"x" equivale a "x"
+    tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in tags
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = CACHE_CONTROL,
+) -> Optional[Response]:
+    # La respuesta depende del usuario del token: la caché del navegador no
+    # debe reutilizarla para otra sesión
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return None
@@ -0,0 +1,34 @@
+from typing import Any, Mapping
+
+# Separador de las etiquetas de columnas anidadas: "campaign__name"
+SEPARATOR = "__"
+
+
+def _drop_empty(data: dict) -> dict | None:
+    for key, value in data.items():
+        if isinstance(value, dict):
+            data[key] = _drop_empty(value)
+
+    # Un LEFT JOIN sin coincidencia deja todas las columnas en NULL
+    if all(value is None for value in data.values()):
+        return None
+    return data
+
+
+def nest_columns(row: Mapping[str, Any]) -> dict:
+    data: dict = {}
+    for key, value in row.items():
+        *path, field = key.split(SEPARATOR)
+        target = data
+        for part in path:
+            target = target.setdefault(part, {})
+        target[field] = value
+
+    for key, value in data.items():
+        if isinstance(value, dict):
+            data[key] = _drop_empty(value)
+    return data
+
+
+def labeled(prefix: str, *columns) -> list:
+    return [column.label(f"{prefix}{SEPARATOR}{column.key}") for column in columns]
@@ -0,0 +1,7 @@
+from typing import Iterable
+from sqlalchemy import ARRAY, Integer, func, literal
+
+
+def unnest_ids(ids: Iterable[int]):
+    # Un solo parámetro array en lugar de un parámetro por id
+    return func.unnest(literal(sorted(set(ids)), ARRAY(Integer)))
@@ -0,0 +1,199 @@
+import re
+import zipfile
+from datetime import date, datetime
+from typing import Any, Iterable
+from xml.sax.saxutils import escape
+
+# Caracteres de control que XML 1.0 no admite (texto libre de comentarios/IA)
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    "{sheets}</Types>"
+)
+
+_CONTENT_TYPE_SHEET = (
+    '<Override PartName="/xl/worksheets/sheet{index}.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    "<sheets>{sheets}</sheets></workbook>"
+)
+
+_WORKBOOK_SHEET = '<sheet name="{name}" sheetId="{index}" r:id="rId{index}"/>'
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    "{sheets}</Relationships>"
+)
+
+_WORKBOOK_RELS_SHEET = (
+    '<Relationship Id="rId{index}" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{index}.xml"/>'
+)
+
+# Límite de filas por hoja de Excel; al llegar se sigue en una hoja nueva
+MAX_SHEET_ROWS = 1_048_576
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+
+_SHEET_END = "</sheetData></worksheet>"
+
+
+class _ChunkBuffer:
+    # Destino no posicionable: zipfile escribe descriptores de datos al final
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell(ref: str, value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat(sep=" ") if isinstance(value, datetime) else str(value)
+
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+# Hoja XLSX escrita fila por fila: cada llamada devuelve los bytes comprimidos
+# listos para enviarse y las celdas usan cadenas en línea (sin sharedStrings).
+# Pasado max_rows sigue en otra hoja y repite la primera fila (encabezado)
+class XlsxStreamWriter:
+    def __init__(self, sheet_name: str = "Sheet1", max_rows: int = MAX_SHEET_ROWS):
+        self._buffer = _ChunkBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, "w", zipfile.ZIP_DEFLATED)
+        self._zip.writestr("_rels/.rels", _ROOT_RELS)
+        self._sheet_name = sheet_name
+        self._max_rows = max_rows
+        self._sheets = 0
+        self._header: list | None = None
+        self._open_sheet()
+
+    def _open_sheet(self) -> None:
+        self._sheets += 1
+        self._sheet = self._zip.open(
+            f"xl/worksheets/sheet{self._sheets}.xml", "w", force_zip64=True
+        )
+        self._sheet.write(_SHEET_START.encode())
+        self._row = 0
+
+    def _close_sheet(self) -> None:
+        self._sheet.write(_SHEET_END.encode())
+        self._sheet.close()
+
+    def _sheet_title(self, index: int) -> str:
+        if index == 1:
+            return self._sheet_name
+        # Excel limita los nombres de hoja a 31 caracteres
+        suffix = f" ({index})"
+        return self._sheet_name[: 31 - len(suffix)] + suffix
+
+    def _row_xml(self, values: Iterable[Any]) -> str:
+        self._row += 1
+        cells = "".join(
+            _cell(f"{_column_letter(i)}{self._row}", value)
+            for i, value in enumerate(values)
+        )
+        return f'<row r="{self._row}">{cells}</row>'
+
+    def write_rows(self, rows: Iterable[Iterable[Any]]) -> bytes:
+        parts = []
+        for values in rows:
+            if self._row >= self._max_rows:
+                self._sheet.write("".join(parts).encode())
+                parts = []
+                self._close_sheet()
+                self._open_sheet()
+                parts.append(self._row_xml(self._header))
+
+            if self._header is None:
+                self._header = values = list(values)
+            parts.append(self._row_xml(values))
+
+        self._sheet.write("".join(parts).encode())
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        self._close_sheet()
+
+        # El orden dentro del zip no importa: el libro se describe al final,
+        # cuando ya se sabe cuántas hojas hubo
+        indexes = range(1, self._sheets + 1)
+        self._zip.writestr(
+            "[Content_Types].xml",
+            _CONTENT_TYPES.format(
+                sheets="".join(_CONTENT_TYPE_SHEET.format(index=i) for i in indexes)
+            ),
+        )
+        self._zip.writestr(
+            "xl/workbook.xml",
+            _WORKBOOK.format(
+                sheets="".join(
+                    _WORKBOOK_SHEET.format(
+                        name=escape(self._sheet_title(i), {'"': "&quot;"}), index=i
+                    )
+                    for i in indexes
+                )
+            ),
+        )
+        self._zip.writestr(
+            "xl/_rels/workbook.xml.rels",
+            _WORKBOOK_RELS.format(
+                sheets="".join(_WORKBOOK_RELS_SHEET.format(index=i) for i in indexes)
+            ),
+        )
+        self._zip.close()
+        return self._buffer.drain()
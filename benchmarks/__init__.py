@@ -0,0 +1,27 @@
+import os
+
+# Credenciales comunes de los usuarios sembrados por seed.py
+BENCH_PASSWORD = "bench-password"
+BENCH_DOMAIN = "bench.example.com"
+
+# Valores de relleno para que Settings cargue sin .env: nada sale de la máquina
+OFFLINE_SETTINGS = {
+    "PROJECT_NAME": "cx-bench",
+    "PROJECT_MODE": "bench",
+    "JWT_SECRET_KEY": "bench",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_EXPIRE": "60",
+    "POSTGRES_URI": "postgresql+asyncpg://bench@localhost/bench",
+    "CLOUDFLARE_STREAM_KEY": "bench",
+    "CLOUDFLARE_ACCOUNT_ID": "bench",
+    "R2_ACCESS_KEY_ID": "bench",
+    "R2_SECRET_ACCESS_KEY": "bench",
+    "R2_BUCKET": "bench",
+    "R2_ENDPOINT_URL": "http://localhost:9000",
+    "OPENAI_API_KEY": "bench",
+}
+
+
+def use_offline_settings() -> None:
+    for name, value in OFFLINE_SETTINGS.items():
+        os.environ.setdefault(name, value)
@@ -0,0 +1,114 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+from benchmarks import OFFLINE_SETTINGS
+
+# Solo los usa el pipeline de audio: un worker de la API no debe cargarlos
+LAZY_MODULES = ("openai", "moviepy", "imageio_ffmpeg")
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Mide el arranque en frío de la API (import de app.main) y "
+        "falla si supera el presupuesto o carga dependencias del pipeline"
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=3000)
+    parser.add_argument("--top", type=int, default=10, help="Paquetes más lentos")
+    parser.add_argument("--json", dest="json_path", help="Guarda el resumen en JSON")
+    return parser.parse_args()
+
+
+def environment() -> dict:
+    # Cada corrida es un intérprete nuevo: sin caché de módulos, como un worker
+    return {**OFFLINE_SETTINGS, **os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+
+
+def probe() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE % (LAZY_MODULES,)],
+        env=environment(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+# Tiempo propio (sin hijos) agrupado por paquete raíz, de python -X importtime
+def slowest_packages(top: int) -> list[tuple[str, float]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=environment(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    totals = Counter()
+    for line in result.stderr.splitlines():
+        if match := _IMPORTTIME.match(line):
+            totals[match.group(2).split(".")[0]] += int(match.group(1))
+    return [(name, us / 1000) for name, us in totals.most_common(top)]
+
+
+def main() -> None:
+    args = parse_args()
+
+    runs = [probe() for _ in range(args.runs)]
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    rss_mb = statistics.median(run["rss_mb"] for run in runs)
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    packages = slowest_packages(args.top)
+
+    print(f"import app.main  p50={import_ms:.0f} ms  RSS={rss_mb:.1f} MB")
+    print(f"\n{'paquete':<20}{'ms':>8}")
+    for name, ms in packages:
+        print(f"{name:<20}{ms:>8.1f}")
+
+    errors = []
+    if import_ms > args.budget_ms:
+        errors.append(f"el import tarda {import_ms:.0f} ms (> {args.budget_ms:.0f})")
+    if loaded:
+        errors.append(f"se cargan módulos del pipeline: {', '.join(loaded)}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as file:
+            json.dump(
+                {
+                    "import_ms": import_ms,
+                    "rss_mb": rss_mb,
+                    "budget_ms": args.budget_ms,
+                    "loaded": loaded,
+                    "packages": dict(packages),
+                },
+                file,
+                indent=2,
+            )
+
+    for error in errors:
+        print(f"\nERROR: {error}", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
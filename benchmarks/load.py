@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import itertools
+import json
+import re
+import statistics
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from benchmarks import BENCH_DOMAIN, BENCH_PASSWORD
+
+# Cabecera que agrega MetricsMiddleware fuera de producción
+_SERVER_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+ROLE_NAMES = {0: "superadmin", 1: "admin", 2: "manager", 3: "evaluator"}
+
+
+@dataclass
+class Scenario:
+    name: str
+    role: int
+    method: str
+    path: str
+    params: dict = field(default_factory=dict)
+    # Páginas de 10 recorridas en los listados paginados
+    pages: int = 0
+
+
+@dataclass
+class Result:
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    db_times: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+
+SCENARIOS = [
+    Scenario("login", 3, "POST", "/auth/login"),
+    Scenario("evaluations_superadmin", 0, "GET", "/evaluations/", pages=20),
+    Scenario("evaluations_admin", 1, "GET", "/evaluations/", pages=20),
+    Scenario("evaluations_manager", 2, "GET", "/evaluations/", pages=20),
+    # El evaluador solo ve sus evaluaciones en edición
+    Scenario("evaluations_evaluator", 3, "GET", "/evaluations/", pages=1),
+    Scenario(
+        "evaluations_search_campaign",
+        1,
+        "GET",
+        "/evaluations/",
+        {"filter": "campaign", "search": "Campaña"},
+        pages=20,
+    ),
+    Scenario(
+        "evaluations_search_evaluator",
+        1,
+        "GET",
+        "/evaluations/",
+        {"filter": "evaluator", "search": "Nombre1"},
+        pages=20,
+    ),
+    Scenario("dashboard_superadmin", 0, "GET", "/dashboard/"),
+    Scenario("dashboard_admin", 1, "GET", "/dashboard/"),
+    Scenario("dashboard_manager", 2, "GET", "/dashboard/"),
+    Scenario("dashboard_evaluator", 3, "GET", "/dashboard/"),
+    Scenario("notifications_manager", 2, "GET", "/notification/"),
+    Scenario("notifications_evaluator", 3, "GET", "/notification/"),
+    Scenario("notifications_count", 3, "GET", "/notification/count"),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Carga concurrente contra los endpoints principales de la API"
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument(
+        "--scenarios",
+        nargs="*",
+        help="Escenarios a ejecutar (por defecto todos): "
+        + ", ".join(s.name for s in SCENARIOS),
+    )
+    parser.add_argument("--accounts", type=int, default=10)
+    # Deben coincidir con los parámetros usados en seed.py
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--users-per-company", type=int, default=500)
+    parser.add_argument("--managers-per-company", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", dest="json_path", help="Guarda el resumen en JSON")
+    return parser.parse_args()
+
+
+def sample_emails(role: int, args: argparse.Namespace) -> list[str]:
+    if role == 0:
+        return [f"superadmin@{BENCH_DOMAIN}"]
+
+    evaluators = args.users_per_company - 1 - args.managers_per_company
+    emails = []
+    # Reparte las cuentas entre empresas para no concentrar la carga en un tenant
+    for i in range(args.accounts):
+        company = 1 + i % args.companies
+        number = 1 + i // args.companies
+        match role:
+            case 1:
+                emails.append(f"admin{company}@{BENCH_DOMAIN}")
+            case 2:
+                number = 1 + (number - 1) % args.managers_per_company
+                emails.append(f"manager{company}.{number}@{BENCH_DOMAIN}")
+            case 3:
+                number = 1 + (number - 1) % evaluators
+                emails.append(f"evaluator{company}.{number}@{BENCH_DOMAIN}")
+
+    return list(dict.fromkeys(emails))
+
+
+async def login(client: httpx.AsyncClient, email: str) -> httpx.Response:
+    return await client.post(
+        "/auth/login", data={"username": email, "password": BENCH_PASSWORD}
+    )
+
+
+async def get_tokens(
+    client: httpx.AsyncClient, roles: set[int], args: argparse.Namespace
+) -> dict[int, list[str]]:
+    tokens = {}
+    for role in roles:
+        tokens[role] = []
+        for email in sample_emails(role, args):
+            response = await login(client, email)
+            response.raise_for_status()
+            tokens[role].append(response.json()["access_token"])
+    return tokens
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    tokens: list[str],
+    emails: list[str],
+    args: argparse.Namespace,
+) -> Result:
+    result = Result()
+    counter = itertools.count()
+    total = args.warmup + args.requests
+
+    async def request(i: int) -> httpx.Response:
+        if scenario.name == "login":
+            return await login(client, emails[i % len(emails)])
+
+        params = dict(scenario.params)
+        if scenario.pages:
+            params["offset"] = (i % scenario.pages) * 10
+            params["limit"] = 10
+
+        return await client.request(
+            scenario.method,
+            scenario.path,
+            params=params,
+            headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"},
+        )
+
+    async def worker():
+        while (i := next(counter)) < total:
+            start = time.perf_counter()
+            try:
+                response = await request(i)
+            except httpx.HTTPError:
+                response = None
+            latency = time.perf_counter() - start
+
+            # Las primeras peticiones calientan conexiones y cachés
+            if i < args.warmup:
+                continue
+
+            result.latencies.append(latency)
+            if response is None or response.status_code >= 400:
+                result.errors += 1
+                continue
+
+            timing = _SERVER_TIMING.search(response.headers.get("server-timing", ""))
+            if timing:
+                result.db_times.append(float(timing.group(1)))
+                result.queries.append(int(timing.group(2)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def summarize(name: str, result: Result) -> dict:
+    latencies = sorted(latency * 1000 for latency in result.latencies)
+    # quantiles necesita al menos dos muestras
+    cuts = (
+        statistics.quantiles(latencies, n=100, method="inclusive")
+        if len(latencies) > 1
+        else latencies * 99
+    )
+
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": result.errors,
+        "rps": len(latencies) / result.elapsed if result.elapsed else 0.0,
+        "p50_ms": cuts[49] if cuts else None,
+        "p95_ms": cuts[94] if cuts else None,
+        "p99_ms": cuts[98] if cuts else None,
+        "queries_per_request": (
+            statistics.mean(result.queries) if result.queries else None
+        ),
+        "db_ms": statistics.mean(result.db_times) if result.db_times else None,
+    }
+
+
+def print_table(rows: list[dict]) -> None:
+    columns = (
+        ("scenario", "escenario", "{}"),
+        ("requests", "n", "{}"),
+        ("errors", "errores", "{}"),
+        ("rps", "req/s", "{:.1f}"),
+        ("p50_ms", "p50 ms", "{:.1f}"),
+        ("p95_ms", "p95 ms", "{:.1f}"),
+        ("p99_ms", "p99 ms", "{:.1f}"),
+        ("queries_per_request", "queries", "{:.1f}"),
+        ("db_ms", "db ms", "{:.1f}"),
+    )
+    table = [[title for _, title, _ in columns]]
+    for row in rows:
+        table.append(
+            [
+                "-" if row[key] is None else fmt.format(row[key])
+                for key, _, fmt in columns
+            ]
+        )
+
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    for line in table:
+        print(
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(line, widths))
+            )
+        )
+
+
+async def main() -> None:
+    args = parse_args()
+
+    scenarios = SCENARIOS
+    if args.scenarios:
+        scenarios = [s for s in SCENARIOS if s.name in args.scenarios]
+        unknown = set(args.scenarios) - {s.name for s in scenarios}
+        if unknown:
+            raise SystemExit(f"Escenarios desconocidos: {', '.join(sorted(unknown))}")
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        tokens = await get_tokens(client, {s.role for s in scenarios}, args)
+
+        rows = []
+        for scenario in scenarios:
+            print(f"{scenario.name} ({ROLE_NAMES[scenario.role]})...", flush=True)
+            result = await run_scenario(
+                client,
+                scenario,
+                tokens[scenario.role],
+                sample_emails(scenario.role, args),
+                args,
+            )
+            rows.append(summarize(scenario.name, result))
+
+    print()
+    print(
+        f"concurrencia={args.concurrency} peticiones={args.requests} "
+        f"base_url={args.base_url}"
+    )
+    print_table(rows)
+
+    if args.json_path:
+        with open(args.json_path, "w") as file:
+            json.dump(
+                {
+                    "concurrency": args.concurrency,
+                    "requests": args.requests,
+                    "base_url": args.base_url,
+                    "results": rows,
+                },
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
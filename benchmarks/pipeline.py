@@ -0,0 +1,484 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+from benchmarks import use_offline_settings
+
+use_offline_settings()
+
+# Registra todos los modelos igual que al levantar la API
+import app.main  # noqa: F401
+from app.core.config import settings
+from app.core.http_client import init_http_client
+from app.services import (
+    cloudflare_rs_services,
+    extract_audio_services,
+    openai_services,
+)
+
+ANALYSIS_RESPONSE = """# -------------------
+# 1. Vista Ejecutiva (Consultiva)
+# -------------------
+Resumen ejecutivo: atención cordial, sin ofrecimiento de productos adicionales.
+
+# -------------------
+# 2. Vista Operativa (Metodológica JSON)
+# -------------------
+```json
+{
+  "IOC": {"score": 50, "justificacion": "Oportunidad identificada"},
+  "IRD": {"score": 0, "justificacion": "Sin señales de riesgo"},
+  "CES": {"score": 25, "justificacion": "Repregunta leve"},
+  "Calidad": {"saludo": true, "identificacion": true, "ofrecimiento": false,
+              "cierre": true, "valor_agregado": false},
+  "Verbatims": {"positivos": [], "negativos": [], "criticos": []},
+  "acciones_sugeridas": ["Capacitar en prospección de productos"]
+}
+```"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Mide el pipeline de video a análisis con servicios simulados"
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument(
+        "--evaluations", type=int, default=16, help="Evaluaciones por nivel"
+    )
+    parser.add_argument(
+        "--video",
+        type=Path,
+        nargs="*",
+        help="MP4 de muestra; si falta se genera uno con ffmpeg",
+    )
+    parser.add_argument("--video-seconds", type=int, default=120)
+    parser.add_argument(
+        "--ready-delay",
+        type=float,
+        default=0.0,
+        help="Segundos hasta que Cloudflare marca el video readyToStream",
+    )
+    parser.add_argument(
+        "--download-delay",
+        type=float,
+        default=0.0,
+        help="Segundos hasta que la descarga MP4 queda lista",
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=float,
+        default=0.0,
+        help="Bytes/s de la descarga simulada (0 = sin límite)",
+    )
+    parser.add_argument("--s3-latency", type=float, default=0.05)
+    parser.add_argument(
+        "--s3-endpoint",
+        help="Endpoint S3 real (p. ej. MinIO) en lugar del almacenamiento en memoria",
+    )
+    parser.add_argument("--transcription-latency", type=float, default=2.0)
+    parser.add_argument("--llm-latency", type=float, default=5.0)
+    parser.add_argument("--db-latency", type=float, default=0.01)
+    parser.add_argument("--json", dest="json_path", help="Guarda el resumen en JSON")
+    return parser.parse_args()
+
+
+# ----------- CLOUDFLARE STREAM -----------
+class FakeCloudflare:
+    def __init__(self, videos: list[bytes], args: argparse.Namespace):
+        self.videos = videos
+        self.ready_delay = args.ready_delay
+        self.download_delay = args.download_delay
+        self.bandwidth = args.bandwidth
+        self.uploaded_at: dict[str, float] = {}
+        self.download_enabled_at: dict[str, float] = {}
+
+    def register(self, uid: str) -> None:
+        self.uploaded_at[uid] = time.monotonic()
+
+    def _video(self, uid: str) -> bytes:
+        return self.videos[hash(uid) % len(self.videos)]
+
+    async def _stream(self, data: bytes):
+        chunk_size = 64 * 1024
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            if self.bandwidth:
+                await asyncio.sleep(len(chunk) / self.bandwidth)
+            yield chunk
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip("/").split("/")
+        now = time.monotonic()
+
+        # GET /client/v4/accounts/{id}/stream/{uid}[/downloads]
+        if request.url.host == "api.cloudflare.com":
+            uid = parts[5]
+            if len(parts) == 6:
+                ready = now - self.uploaded_at[uid] >= self.ready_delay
+                return httpx.Response(
+                    200, json={"result": {"uid": uid, "readyToStream": ready}}
+                )
+
+            if request.method == "POST":
+                self.download_enabled_at.setdefault(uid, now)
+                return httpx.Response(
+                    200, json={"result": {"default": {"status": "inprogress"}}}
+                )
+
+            enabled_at = self.download_enabled_at.get(uid)
+            if enabled_at is None or now - enabled_at < self.download_delay:
+                return httpx.Response(
+                    200, json={"result": {"default": {"status": "inprogress"}}}
+                )
+            url = f"https://customer-bench.cloudflarestream.com/{uid}/downloads/default.mp4"
+            return httpx.Response(
+                200, json={"result": {"default": {"status": "ready", "url": url}}}
+            )
+
+        # GET https://customer-*.cloudflarestream.com/{uid}/downloads/default.mp4
+        data = self._video(parts[0])
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "video/mp4", "Content-Length": str(len(data))},
+            content=self._stream(data),
+        )
+
+
+# ----------- R2 -----------
+class FakeS3Client:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.objects: dict[tuple[str, str], int] = {}
+        self.uploads: dict[str, dict[int, int]] = {}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs):
+        time.sleep(self.latency)
+        self.objects[(Bucket, Key)] = len(Body)
+
+    def upload_file(self, Filename: str, Bucket: str, Key: str, **kwargs):
+        time.sleep(self.latency)
+        self.objects[(Bucket, Key)] = os.path.getsize(Filename)
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **kwargs):
+        upload_id = uuid.uuid4().hex
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, UploadId: str, PartNumber: int, Body: bytes, **kwargs):
+        time.sleep(self.latency)
+        self.uploads[UploadId][PartNumber] = len(Body)
+        return {"ETag": f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **kwargs):
+        self.objects[(Bucket, Key)] = sum(self.uploads.pop(UploadId).values())
+
+    def abort_multipart_upload(self, UploadId: str, **kwargs):
+        self.uploads.pop(UploadId, None)
+
+    def close(self):
+        pass
+
+
+class FakeBoto3:
+    def __init__(self, client: FakeS3Client):
+        self._client = client
+
+    def Session(self, *args, **kwargs):
+        return self
+
+    def client(self, *args, **kwargs) -> FakeS3Client:
+        return self._client
+
+
+# ----------- OPENAI -----------
+def openai_handler(args: argparse.Namespace):
+    def handler(request: httpx.Request) -> httpx.Response:
+        # Corre dentro del threadpool del pipeline, igual que el SDK real
+        if request.url.path.endswith("/audio/transcriptions"):
+            request.read()
+            time.sleep(args.transcription_latency)
+            return httpx.Response(
+                200,
+                text="Buenos días, bienvenido. ¿En qué le puedo ayudar? " * 50,
+                headers={"Content-Type": "text/plain"},
+            )
+
+        time.sleep(args.llm_latency)
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "gpt-4o",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {
+                            "role": "assistant",
+                            "content": ANALYSIS_RESPONSE,
+                        },
+                    }
+                ],
+            },
+        )
+
+    return handler
+
+
+# ----------- BASE DE DATOS -----------
+class FakeSession:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.rows = 0
+
+    def add(self, instance) -> None:
+        self.rows += 1
+        instance.id = self.rows
+
+    async def commit(self) -> None:
+        await asyncio.sleep(self.latency)
+
+    async def refresh(self, instance) -> None:
+        await asyncio.sleep(self.latency)
+
+
+# ----------- MUESTRAS -----------
+def sample_video(seconds: int) -> Path:
+    import imageio_ffmpeg
+
+    path = Path(tempfile.gettempdir()) / "cx-bench" / f"sample-{seconds}s.mp4"
+    if path.exists():
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    print(f"Generando video de muestra de {seconds}s en {path}")
+    subprocess.run(
+        [
+            imageio_ffmpeg.get_ffmpeg_exe(),
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=size=640x360:rate=25:duration={seconds}",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:duration={seconds}",
+            "-c:v",
+            "libx264",
+            "-pix_fmt",
+            "yuv420p",
+            "-c:a",
+            "aac",
+            "-shortest",
+            str(path),
+        ],
+        check=True,
+    )
+    return path
+
+
+# ----------- MEDICIONES -----------
+class StageRecorder(logging.Handler):
+    # Reutiliza los registros de pipeline_stage en lugar de medir por fuera
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.durations: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        stage = getattr(record, "stage", None)
+        if stage is None:
+            return
+        self.durations[stage].append(record.duration)
+        self.statuses[stage][record.status] += 1
+
+    def reset(self) -> None:
+        self.durations.clear()
+        self.statuses.clear()
+
+
+def _rss(pid: int | str) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss() -> int:
+    # Incluye los ffmpeg que lanza moviepy durante la extracción
+    pid = os.getpid()
+    total = _rss(pid)
+    for task in Path(f"/proc/{pid}/task").glob("*/children"):
+        for child in task.read_text().split():
+            total += _rss(child)
+    return total
+
+
+def directory_size(path: Path) -> int:
+    total = 0
+    for entry in os.scandir(path):
+        try:
+            total += entry.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+async def sample_resources(tmp_dir: Path, peaks: dict, interval: float = 0.05):
+    while True:
+        peaks["rss"] = max(peaks["rss"], process_tree_rss())
+        peaks["tmp"] = max(peaks["tmp"], directory_size(tmp_dir))
+        await asyncio.sleep(interval)
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def run_level(
+    concurrency: int,
+    args: argparse.Namespace,
+    cloudflare: FakeCloudflare,
+    recorder: StageRecorder,
+    tmp_dir: Path,
+) -> dict:
+    recorder.reset()
+    semaphore = asyncio.Semaphore(concurrency)
+    peaks = {"rss": process_tree_rss(), "tmp": 0}
+    session = FakeSession(args.db_latency)
+
+    async def evaluate(evaluation_id: int):
+        async with semaphore:
+            uid = uuid.uuid4().hex
+            cloudflare.register(uid)
+            return await extract_audio_services.handle_stream_to_audio(
+                uid, evaluation_id, session
+            )
+
+    sampler = asyncio.create_task(sample_resources(tmp_dir, peaks))
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(evaluate(i) for i in range(1, args.evaluations + 1))
+    )
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+
+    completed = sum(result is not None for result in results)
+    return {
+        "concurrency": concurrency,
+        "evaluations": args.evaluations,
+        "completed": completed,
+        "failed": args.evaluations - completed,
+        "elapsed_s": elapsed,
+        "evaluations_per_minute": completed / elapsed * 60,
+        "peak_rss_mb": peaks["rss"] / 1024**2,
+        "peak_tmp_mb": peaks["tmp"] / 1024**2,
+        "stages": {
+            stage: {
+                "count": len(durations),
+                "p50_s": percentile(durations, 50),
+                "p95_s": percentile(durations, 95),
+                "max_s": max(durations),
+                "statuses": dict(recorder.statuses[stage]),
+            }
+            for stage, durations in recorder.durations.items()
+        },
+    }
+
+
+def print_results(rows: list[dict]) -> None:
+    print()
+    print(
+        f"{'concurrencia':>12} {'ok':>4} {'fallos':>6} {'seg':>8} "
+        f"{'eval/min':>9} {'RSS MB':>8} {'tmp MB':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['concurrency']:>12} {row['completed']:>4} {row['failed']:>6} "
+            f"{row['elapsed_s']:>8.1f} {row['evaluations_per_minute']:>9.1f} "
+            f"{row['peak_rss_mb']:>8.1f} {row['peak_tmp_mb']:>8.1f}"
+        )
+
+    print()
+    print(f"{'concurrencia':>12} {'etapa':<14} {'p50 s':>8} {'p95 s':>8} {'max s':>8}")
+    for row in rows:
+        for stage, data in row["stages"].items():
+            print(
+                f"{row['concurrency']:>12} {stage:<14} {data['p50_s']:>8.2f} "
+                f"{data['p95_s']:>8.2f} {data['max_s']:>8.2f}"
+            )
+
+
+async def main() -> None:
+    args = parse_args()
+
+    videos = [path.read_bytes() for path in args.video or []]
+    if not videos:
+        videos = [sample_video(args.video_seconds).read_bytes()]
+
+    cloudflare = FakeCloudflare(videos, args)
+    init_http_client(transport=httpx.MockTransport(cloudflare.handler))
+
+    if args.s3_endpoint:
+        settings.R2_ENDPOINT_URL = args.s3_endpoint
+    else:
+        cloudflare_rs_services.boto3 = FakeBoto3(FakeS3Client(args.s3_latency))
+
+    openai_services.init_openai_client(
+        api_key="bench",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(openai_handler(args))),
+    )
+
+    recorder = StageRecorder()
+    stage_logger = logging.getLogger(extract_audio_services.__name__)
+    stage_logger.addHandler(recorder)
+    stage_logger.setLevel(logging.INFO)
+
+    # Solo avisos y errores en consola; las etapas van al recorder
+    for handler in logging.getLogger("app").handlers:
+        handler.setLevel(logging.WARNING)
+
+    # Directorio temporal propio para medir cuánto disco ocupa el pipeline
+    with tempfile.TemporaryDirectory(prefix="cx-pipeline-") as tmp:
+        tempfile.tempdir = tmp
+        rows = []
+        for concurrency in args.concurrency:
+            print(f"concurrencia {concurrency}...", flush=True)
+            rows.append(
+                await run_level(concurrency, args, cloudflare, recorder, Path(tmp))
+            )
+        tempfile.tempdir = None
+
+    print_results(rows)
+
+    if args.json_path:
+        with open(args.json_path, "w") as file:
+            json.dump(
+                {"args": vars(args), "results": rows}, file, indent=2, default=str
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,452 @@
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from benchmarks import BENCH_DOMAIN, BENCH_PASSWORD
+
+# Las mismas zonas que siembra la aplicación
+ZONES_SQL = Path(__file__).resolve().parent.parent / "app/seeder/zones_seeder.sql"
+
+TABLES = (
+    "notifications",
+    "evaluation_analysis",
+    "evaluation_answers",
+    "evaluations",
+    "campaign_goals_evaluators",
+    "campaign_users",
+    "campaign_zones",
+    "campaigns",
+    "survey_aspects",
+    "survey_sections",
+    "survey_forms",
+    "user_zones",
+    "users",
+    "zones",
+    "payments",
+    "companies",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Siembra una base Postgres con datos multiempresa para benchmarks"
+    )
+    parser.add_argument("--database-url", default=settings.POSTGRES_URI)
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--users-per-company", type=int, default=500)
+    parser.add_argument("--managers-per-company", type=int, default=10)
+    parser.add_argument(
+        "--zones-sql",
+        type=Path,
+        default=ZONES_SQL,
+        help="Script SQL con los INSERT de zonas",
+    )
+    parser.add_argument(
+        "--synthetic-zones",
+        action="store_true",
+        help="Genera --zones zonas sintéticas en lugar de cargar --zones-sql",
+    )
+    parser.add_argument("--zones", type=int, default=200)
+    parser.add_argument("--campaigns-per-company", type=int, default=8)
+    parser.add_argument("--sections", type=int, default=3)
+    parser.add_argument("--aspects-per-section", type=int, default=4)
+    parser.add_argument("--evaluations", type=int, default=1_000_000)
+    parser.add_argument("--analysis-ratio", type=float, default=0.2)
+    parser.add_argument("--notification-ratio", type=float, default=0.1)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=float, default=0.42)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Permite sembrar aunque PROJECT_MODE sea prod",
+    )
+    return parser.parse_args()
+
+
+async def step(conn: AsyncConnection, label: str, sql: str, **params) -> int:
+    start = time.perf_counter()
+    result = await conn.execute(text(sql), params)
+    print(f"  {label}: {result.rowcount} filas en {time.perf_counter() - start:.1f}s")
+    return result.rowcount
+
+
+async def seed_tenants(conn: AsyncConnection, args: argparse.Namespace) -> None:
+    await step(
+        conn,
+        "companies",
+        """
+        INSERT INTO companies (name, phone, email, address, state, country,
+                               created_at, updated_at)
+        SELECT 'Empresa ' || c, '0990000' || lpad(c::text, 3, '0'),
+               'empresa' || c || '@' || :domain, 'Av. Principal ' || c,
+               'Pichincha', 'Ecuador', now(), now()
+        FROM generate_series(1, :companies) c
+        """,
+        companies=args.companies,
+        domain=BENCH_DOMAIN,
+    )
+    # Pago vigente para que el login no responda 402
+    await step(
+        conn,
+        "payments",
+        """
+        INSERT INTO payments (company_id, amount, date, description, valid_before,
+                              created_at, updated_at)
+        SELECT id, 100, now() - interval '1 day', 'Benchmark',
+               now() + interval '1 year', now(), now()
+        FROM companies
+        """,
+    )
+
+    if not args.synthetic_zones:
+        await conn.exec_driver_sql(args.zones_sql.read_text())
+        zones = await conn.scalar(text("SELECT count(*) FROM zones"))
+        print(f"  zones: {zones} cargadas desde {args.zones_sql}")
+    else:
+        await step(
+            conn,
+            "zones",
+            """
+            INSERT INTO zones (name, value, country, created_at, updated_at)
+            SELECT 'Zona ' || z, 'zona-' || z, 'Ecuador', now(), now()
+            FROM generate_series(1, :zones) z
+            """,
+            zones=args.zones,
+        )
+
+
+async def seed_users(conn: AsyncConnection, args: argparse.Namespace) -> None:
+    # Un solo hash bcrypt: generar miles tardaría minutos y no aporta nada
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+
+    # n = 1 admin, luego managers y el resto evaluadores de cada empresa
+    await step(
+        conn,
+        "users",
+        """
+        INSERT INTO users (role, first_name, last_name, gender, email, company_id,
+                           hashed_password, birthdate, civil_status, socioeconomic,
+                           inclusivity, created_at, updated_at)
+        SELECT CASE WHEN n = 1 THEN 1 WHEN n <= 1 + :managers THEN 2 ELSE 3 END,
+               'Nombre' || n, 'Apellido' || c,
+               (ARRAY['MALE', 'FEMALE', 'OTHER'])[1 + n % 3]::genderenum,
+               CASE
+                   WHEN n = 1 THEN 'admin' || c
+                   WHEN n <= 1 + :managers THEN 'manager' || c || '.' || (n - 1)
+                   ELSE 'evaluator' || c || '.' || (n - 1 - :managers)
+               END || '@' || :domain,
+               c, :hashed_password,
+               now() - (20 + n % 40) * interval '1 year',
+               (ARRAY['SINGLE', 'MARRIED', 'DIVORCED', 'WIDOWED',
+                      'SEPARATED'])[1 + n % 5]::civilstatusenum,
+               (ARRAY['LOW', 'MEDIUM', 'HIGH'])[1 + n % 3]::socioeconomicenum,
+               'Ninguna', now(), now()
+        FROM generate_series(1, :companies) c,
+             generate_series(1, :users_per_company) n
+        ORDER BY c, n
+        """,
+        companies=args.companies,
+        users_per_company=args.users_per_company,
+        managers=args.managers_per_company,
+        domain=BENCH_DOMAIN,
+        hashed_password=hashed_password,
+    )
+    await step(
+        conn,
+        "superadmin",
+        """
+        INSERT INTO users (role, first_name, last_name, gender, email, company_id,
+                           hashed_password, birthdate, civil_status, socioeconomic,
+                           inclusivity, created_at, updated_at)
+        VALUES (0, 'Super', 'Admin', 'OTHER', 'superadmin@' || :domain, 1,
+                :hashed_password, now() - interval '30 years', 'SINGLE', 'MEDIUM',
+                'Ninguna', now(), now())
+        """,
+        domain=BENCH_DOMAIN,
+        hashed_password=hashed_password,
+    )
+    # Uno o dos zonas por manager/evaluador, repartidas de forma determinista
+    await step(
+        conn,
+        "user_zones",
+        """
+        INSERT INTO user_zones (user_id, zone_id, created_at, updated_at)
+        SELECT DISTINCT u.id, z.ids[1 + (u.id * k) % cardinality(z.ids)], now(), now()
+        FROM users u
+        CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids FROM zones) z
+        CROSS JOIN generate_series(1, 2) k
+        WHERE u.role IN (2, 3) AND (k = 1 OR u.id % 2 = 0)
+        """,
+    )
+
+
+async def seed_surveys(conn: AsyncConnection, args: argparse.Namespace) -> None:
+    await step(
+        conn,
+        "survey_forms",
+        """
+        INSERT INTO survey_forms (title, company_id, version, created_at, updated_at)
+        SELECT 'Formulario ' || name, id, 1, now(), now() FROM companies
+        """,
+    )
+    await step(
+        conn,
+        "survey_sections",
+        """
+        INSERT INTO survey_sections (name, maximum_score, "order", form_id,
+                                     created_at, updated_at)
+        SELECT 'Sección ' || s, 10 * :aspects, s, f.id, now(), now()
+        FROM survey_forms f, generate_series(1, :sections) s
+        """,
+        sections=args.sections,
+        aspects=args.aspects_per_section,
+    )
+    # Cada cuarto aspecto es booleano, el resto puntuado de 0 a 10
+    await step(
+        conn,
+        "survey_aspects",
+        """
+        INSERT INTO survey_aspects (description, maximum_score, section_id, "order",
+                                    type, created_at, updated_at)
+        SELECT 'Aspecto ' || a, CASE WHEN a % 4 = 0 THEN NULL ELSE 10 END, s.id, a,
+               (CASE WHEN a % 4 = 0 THEN 'BOOLEAN' ELSE 'NUMBER' END)::aspecttypeenum,
+               now(), now()
+        FROM survey_sections s, generate_series(1, :aspects) a
+        """,
+        aspects=args.aspects_per_section,
+    )
+
+
+async def seed_campaigns(conn: AsyncConnection, args: argparse.Namespace) -> None:
+    # Las campañas impares siguen vigentes, las pares ya terminaron
+    await step(
+        conn,
+        "campaigns",
+        """
+        INSERT INTO campaigns (company_id, name, objective, date_start, date_end,
+                               channel, survey_id, goal, created_at, updated_at)
+        SELECT f.company_id, 'Campaña ' || f.company_id || '-' || k,
+               'Objetivo de la campaña ' || k,
+               now() - interval '1 year',
+               CASE WHEN k % 2 = 1 THEN now() + interval '90 days'
+                    ELSE now() - interval '10 days' END,
+               (ARRAY['presencial', 'telefonico', 'online'])[1 + k % 3]::channeltype,
+               f.id, 100, now(), now()
+        FROM survey_forms f, generate_series(1, :campaigns) k
+        ORDER BY f.company_id, k
+        """,
+        campaigns=args.campaigns_per_company,
+    )
+    await step(
+        conn,
+        "campaign_zones",
+        """
+        INSERT INTO campaign_zones (campaign_id, zone_id, created_at, updated_at)
+        SELECT DISTINCT c.id, z.ids[1 + (c.id * 3 + j) % cardinality(z.ids)],
+               now(), now()
+        FROM campaigns c
+        CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids FROM zones) z
+        CROSS JOIN generate_series(0, 2) j
+        """,
+    )
+    # Cada evaluador queda asignado directamente a una campaña de su empresa
+    await step(
+        conn,
+        "campaign_users",
+        """
+        INSERT INTO campaign_users (campaign_id, user_id, created_at, updated_at)
+        SELECT cp.ids[1 + u.id % cardinality(cp.ids)], u.id, now(), now()
+        FROM users u
+        JOIN (
+            SELECT company_id, array_agg(id ORDER BY id) AS ids
+            FROM campaigns GROUP BY company_id
+        ) cp ON cp.company_id = u.company_id
+        WHERE u.role = 3
+        """,
+    )
+    await step(
+        conn,
+        "campaign_goals_evaluators",
+        """
+        INSERT INTO campaign_goals_evaluators (evaluator_id, campaign_id, goal,
+                                               created_at, updated_at)
+        SELECT user_id, campaign_id, 20, now(), now() FROM campaign_users
+        """,
+    )
+
+
+async def seed_evaluations(conn: AsyncConnection, args: argparse.Namespace) -> None:
+    await conn.execute(text("SELECT setseed(:seed)"), {"seed": args.seed})
+
+    for start in range(0, args.evaluations, args.batch_size):
+        stop = min(start + args.batch_size, args.evaluations)
+        print(f"  lote {start:,}-{stop:,}")
+
+        # Estados con una distribución parecida a la de producción
+        await step(
+            conn,
+            "evaluations",
+            """
+            WITH evaluators AS (
+                SELECT company_id, array_agg(id ORDER BY id) AS ids
+                FROM users WHERE role = 3 GROUP BY company_id
+            ), company_campaigns AS (
+                SELECT company_id, array_agg(id ORDER BY id) AS ids
+                FROM campaigns GROUP BY company_id
+            ), campaign_zone_ids AS (
+                SELECT campaign_id, array_agg(zone_id ORDER BY zone_id) AS ids
+                FROM campaign_zones GROUP BY campaign_id
+            ), draws AS (
+                SELECT i, random() AS r, random() AS e, random() AS c,
+                       random() AS t
+                FROM generate_series(:start, :stop - 1) i
+            )
+            INSERT INTO evaluations (user_id, campaigns_id, location,
+                                     evaluated_collaborator, visited_zones, status,
+                                     created_at, updated_at)
+            SELECT ev.ids[1 + floor(d.e * cardinality(ev.ids))::int], p.campaign_id,
+                   'Local ' || (d.i % 500), 'Colaborador ' || (d.i % 2000),
+                   cz.ids[1:1 + d.i % cardinality(cz.ids)],
+                   (CASE WHEN d.r < 0.40 THEN 'SEND'
+                         WHEN d.r < 0.75 THEN 'APROVED'
+                         WHEN d.r < 0.85 THEN 'REJECTED'
+                         WHEN d.r < 0.95 THEN 'UPDATED'
+                         ELSE 'EDIT' END)::statusenum,
+                   now() - d.t * interval '365 days',
+                   now() - d.t * interval '365 days'
+            FROM draws d
+            JOIN evaluators ev ON ev.company_id = 1 + d.i % :companies
+            JOIN company_campaigns cp ON cp.company_id = ev.company_id
+            CROSS JOIN LATERAL (
+                SELECT cp.ids[1 + floor(d.c * cardinality(cp.ids))::int]
+                    AS campaign_id
+            ) p
+            JOIN campaign_zone_ids cz ON cz.campaign_id = p.campaign_id
+            ORDER BY d.i
+            """,
+            start=start,
+            stop=stop,
+            companies=args.companies,
+        )
+        bounds = await conn.execute(
+            text("SELECT min(id), max(id) FROM evaluations WHERE id > :after"),
+            {"after": start},
+        )
+        low, high = bounds.one()
+
+        await step(
+            conn,
+            "evaluation_answers",
+            """
+            INSERT INTO evaluation_answers (evaluation_id, aspect_id, value_number,
+                                            value_boolean, created_at, updated_at)
+            SELECT e.id, a.id,
+                   CASE WHEN a.type = 'NUMBER'
+                        THEN floor(random() * (a.maximum_score + 1))::int END,
+                   CASE WHEN a.type = 'BOOLEAN' THEN random() < 0.8 END,
+                   e.created_at, e.created_at
+            FROM evaluations e
+            JOIN campaigns c ON c.id = e.campaigns_id
+            JOIN survey_sections s ON s.form_id = c.survey_id
+            JOIN survey_aspects a ON a.section_id = s.id
+            WHERE e.id BETWEEN :low AND :high
+            """,
+            low=low,
+            high=high,
+        )
+        # Vista operativa con la misma forma JSON que devuelve el modelo
+        await step(
+            conn,
+            "evaluation_analysis",
+            """
+            INSERT INTO evaluation_analysis (evaluation_id, analysis, executive_view,
+                                             operative_view, created_at, updated_at)
+            SELECT e.id, 'Análisis de la evaluación ' || e.id,
+                   'Resumen ejecutivo de la evaluación ' || e.id,
+                   json_build_object(
+                       'IOC', json_build_object('score', floor(random() * 101)),
+                       'IRD', json_build_object('score', floor(random() * 101)),
+                       'CES', json_build_object('score', floor(random() * 101)),
+                       'Calidad', json_build_object(
+                           'saludo', random() < 0.9,
+                           'identificacion', random() < 0.8,
+                           'ofrecimiento', random() < 0.7,
+                           'cierre', random() < 0.8,
+                           'valor_agregado', random() < 0.5
+                       ),
+                       'acciones_sugeridas', json_build_array(
+                           'Mejorar el saludo', 'Ofrecer productos adicionales'
+                       )
+                   )::text,
+                   e.created_at, e.created_at
+            FROM evaluations e
+            WHERE e.id BETWEEN :low AND :high AND random() < :ratio
+            """,
+            low=low,
+            high=high,
+            ratio=args.analysis_ratio,
+        )
+        await step(
+            conn,
+            "notifications",
+            """
+            INSERT INTO notifications (user_id, evaluation_id, status, read, comment,
+                                       created_at, updated_at)
+            SELECT e.user_id, e.id, e.status, random() < 0.5,
+                   'Revisión de la evaluación ' || e.id, e.updated_at, e.updated_at
+            FROM evaluations e
+            WHERE e.id BETWEEN :low AND :high
+              AND e.status IN ('APROVED', 'REJECTED')
+              AND random() < :ratio
+            """,
+            low=low,
+            high=high,
+            ratio=args.notification_ratio,
+        )
+        await conn.commit()
+
+
+async def main() -> None:
+    args = parse_args()
+
+    if settings.PROJECT_MODE == "prod" and not args.force:
+        raise SystemExit("PROJECT_MODE=prod: usa --force si de verdad quieres sembrar")
+
+    engine = create_async_engine(args.database_url)
+    start = time.perf_counter()
+
+    async with engine.connect() as conn:
+        print("Vaciando tablas")
+        await conn.execute(
+            text(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+        )
+
+        print("Empresas, pagos y zonas")
+        await seed_tenants(conn, args)
+        print("Usuarios")
+        await seed_users(conn, args)
+        print("Formularios")
+        await seed_surveys(conn, args)
+        print("Campañas")
+        await seed_campaigns(conn, args)
+        await conn.commit()
+
+        print("Evaluaciones")
+        await seed_evaluations(conn, args)
+
+        print("Actualizando estadísticas")
+        await conn.exec_driver_sql(f"ANALYZE {', '.join(TABLES)}")
+        await conn.commit()
+
+    await engine.dispose()
+    print(f"Listo en {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
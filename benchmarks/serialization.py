@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+from typing import Any, List
+
+import httpx
+
+from benchmarks import use_offline_settings
+
+use_offline_settings()
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.utils import create_model_field
+
+# Registra todos los modelos igual que al levantar la API
+import app.main  # noqa: F401
+from app.models.campaign_model import Campaign
+from app.models.evaluation_model import (
+    Evaluation,
+    EvaluationAnswer,
+    EvaluationListItem,
+    EvaluationPublic,
+    EvaluationsPublic,
+)
+from app.models.notification_model import NotificationListItem
+from app.models.survey_forms_model import SurveyForm, SurveyFormPublic
+from app.models.survey_model import SurveyAspect, SurveySection
+from app.models.user_model import User
+from app.types.pagination import Pagination
+
+RESPONSE_CLASSES = {"json": JSONResponse, "orjson": ORJSONResponse}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compara el costo de serializar respuestas grandes con "
+        "json y orjson"
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--sections", type=int, default=10)
+    parser.add_argument("--aspects", type=int, default=8, help="Aspectos por sección")
+    parser.add_argument("--page", type=int, default=50, help="Filas del listado")
+    parser.add_argument("--notifications", type=int, default=800)
+    parser.add_argument("--json", dest="json_path", help="Guarda el resumen en JSON")
+    return parser.parse_args()
+
+
+# Entidades ORM en memoria con las relaciones cargadas, como tras selectinload
+def build_form(args: argparse.Namespace, now: datetime) -> SurveyForm:
+    form = SurveyForm(
+        id=1, title="Formulario", company_id=1, created_at=now, updated_at=now
+    )
+    for s in range(args.sections):
+        section = SurveySection(
+            id=s + 1,
+            name=f"Sección {s + 1}",
+            maximum_score=100,
+            order=s,
+            form_id=1,
+            created_at=now,
+            updated_at=now,
+        )
+        for a in range(args.aspects):
+            section.aspects.append(
+                SurveyAspect(
+                    id=s * args.aspects + a + 1,
+                    description=f"¿El colaborador cumplió el aspecto {a + 1}?",
+                    maximum_score=10,
+                    section_id=s + 1,
+                    order=a,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        form.sections.append(section)
+    return form
+
+
+def build_evaluation(form: SurveyForm, now: datetime) -> Evaluation:
+    campaign = Campaign(
+        id=1,
+        company_id=1,
+        name="Campaña",
+        objective="Objetivo",
+        date_start=now,
+        date_end=now,
+        survey_id=1,
+        notes="Notas",
+        goal=100,
+        created_at=now,
+        updated_at=now,
+    )
+    campaign.survey = form
+    user = User(
+        id=1,
+        first_name="Nombre",
+        last_name="Apellido",
+        email="evaluador@bench.example.com",
+        hashed_password="-",
+        inclusivity="Ninguna",
+        company_id=1,
+        created_at=now,
+        updated_at=now,
+    )
+    evaluation = Evaluation(
+        id=1,
+        campaigns_id=1,
+        user_id=1,
+        location="Local",
+        evaluated_collaborator="Colaborador",
+        visited_zones=[1, 2, 3],
+        created_at=now,
+        updated_at=now,
+    )
+    evaluation.campaign = campaign
+    evaluation.user = user
+
+    for section in form.sections:
+        for aspect in section.aspects:
+            answer = EvaluationAnswer(
+                id=aspect.id,
+                evaluation_id=1,
+                aspect_id=aspect.id,
+                value_number=8,
+                comment="Cumple parcialmente",
+                created_at=now,
+                updated_at=now,
+            )
+            answer.aspect = aspect
+            evaluation.evaluation_answers.append(answer)
+    return evaluation
+
+
+def summaries(now: datetime) -> dict:
+    return {
+        "campaign": {
+            "id": 1,
+            "name": "Campaña",
+            "channel": "online",
+            "date_start": now,
+            "date_end": now,
+        },
+        "user": {
+            "id": 1,
+            "first_name": "Nombre",
+            "last_name": "Apellido",
+            "email": "evaluador@bench.example.com",
+            "role": 3,
+        },
+    }
+
+
+def build_payloads(args: argparse.Namespace) -> list[tuple[str, Any, Any]]:
+    now = datetime.now()
+    form = build_form(args, now)
+    nested = summaries(now)
+
+    page = EvaluationsPublic(
+        data=[
+            EvaluationListItem(
+                id=i,
+                campaigns_id=1,
+                video_id=None,
+                user_id=1,
+                location="Local",
+                evaluated_collaborator="Colaborador",
+                status="aprobado",
+                visited_zones=[1, 2],
+                created_at=now,
+                updated_at=now,
+                deleted_at=None,
+                **nested,
+            )
+            for i in range(args.page)
+        ],
+        pagination=Pagination(first=0, rows=args.page, total=args.page),
+    )
+    notifications = [
+        NotificationListItem(
+            id=i,
+            user_id=1,
+            evaluation_id=i,
+            status="enviado",
+            read=False,
+            comment="Evaluación enviada para revisión",
+            user=nested["user"],
+            evaluation={
+                "id": i,
+                "status": "enviado",
+                "evaluated_collaborator": "Colaborador",
+                "campaign": nested["campaign"],
+            },
+            created_at=now,
+            updated_at=now,
+            deleted_at=None,
+        )
+        for i in range(args.notifications)
+    ]
+
+    return [
+        ("evaluation_detail", EvaluationPublic, build_evaluation(form, now)),
+        ("survey_form", SurveyFormPublic, form),
+        ("evaluations_page", EvaluationsPublic, page),
+        ("notifications", List[NotificationListItem], notifications),
+    ]
+
+
+def timed(function, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+# Cada etapa de serialize_response de FastAPI por separado
+def stages(response_type, payload, iterations: int) -> dict:
+    field = create_model_field(
+        name="Response_bench", type_=response_type, mode="serialization"
+    )
+    value, _ = field.validate(payload, {}, loc=("response",))
+    content = field.serialize(value)
+
+    return {
+        "validate_ms": timed(
+            lambda: field.validate(payload, {}, loc=("response",)), iterations
+        ),
+        "serialize_ms": timed(lambda: field.serialize(value), iterations),
+        **{
+            f"{name}_render_ms": timed(lambda cls=cls: cls(content).body, iterations)
+            for name, cls in RESPONSE_CLASSES.items()
+        },
+    }
+
+
+async def end_to_end(response_type, payload, iterations: int) -> dict:
+    results = {}
+    for name, response_class in RESPONSE_CLASSES.items():
+        bench_app = FastAPI(default_response_class=response_class)
+
+        @bench_app.get("/", response_model=response_type)
+        async def endpoint():
+            return payload
+
+        transport = httpx.ASGITransport(app=bench_app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            latencies = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                response = await client.get("/")
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        results[f"{name}_p50_ms"] = statistics.median(latencies)
+        results["bytes"] = len(response.content)
+    return results
+
+
+async def main() -> None:
+    args = parse_args()
+
+    rows = []
+    for name, response_type, payload in build_payloads(args):
+        print(f"{name}...", flush=True)
+        rows.append(
+            {
+                "payload": name,
+                **stages(response_type, payload, args.iterations),
+                **await end_to_end(response_type, payload, args.iterations),
+            }
+        )
+
+    print()
+    header = (
+        f"{'payload':<20}{'bytes':>9}{'validate':>10}{'serialize':>11}"
+        f"{'json':>8}{'orjson':>8}{'p50 json':>10}{'p50 orjson':>12}{'x':>6}"
+    )
+    print(header)
+    for row in rows:
+        print(
+            f"{row['payload']:<20}{row['bytes']:>9}{row['validate_ms']:>10.2f}"
+            f"{row['serialize_ms']:>11.2f}{row['json_render_ms']:>8.2f}"
+            f"{row['orjson_render_ms']:>8.2f}{row['json_p50_ms']:>10.2f}"
+            f"{row['orjson_p50_ms']:>12.2f}"
+            f"{row['json_p50_ms'] / row['orjson_p50_ms']:>6.2f}"
+        )
+    print("\nTiempos en ms por respuesta; x = p50 json / p50 orjson")
+
+    if args.json_path:
+        with open(args.json_path, "w") as file:
+            json.dump({"iterations": args.iterations, "results": rows}, file, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())